@@ -0,0 +1,295 @@
+"""Headless benchmarks for the animal spawner simulation core.
+
+Measures spawn throughput, per-frame update cost, the cost of removing one
+animal, collision resolution through the spatial grid and memory per animal
+at several crowd sizes, without creating a Tk window:
+
+    python benchmarks.py                       # 1k, 10k, 100k and 1M animals
+    python benchmarks.py --sizes 1000 10000    # quicker run
+    python benchmarks.py --save-baseline       # store results as the new baseline
+    python benchmarks.py --memory --sizes 100000 1000000   # dicts vs the column store
+    python benchmarks.py --snapshot --sizes 1000000         # save/restore time
+
+Results are written as JSON. When a baseline file exists, every metric is
+compared against it and the run exits with status 1 if any got worse by
+more than the tolerance.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from entity_store import np
+from snapshot import save_snapshot, load_snapshot
+from spawner_core import SpawnerSimulation
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SCREEN_WIDTH, SCREEN_HEIGHT = 1920, 1080
+FRAME_DT = 1 / 60
+
+# Metric name -> True when a higher value is better
+METRICS = {
+    'spawn_per_second': True,
+    'update_static_ms': False,
+    'update_moving_ms': False,
+    'remove_us': False,
+    'collide_us': False,
+    'bytes_per_animal': False,
+}
+
+
+def build_simulation(count, seed=0, use_numpy=None, batch=1):
+    sim = SpawnerSimulation(SCREEN_WIDTH, SCREEN_HEIGHT, rng=random.Random(seed), use_numpy=use_numpy)
+    for start in range(0, count, batch):
+        sim.create_animals(min(batch, count - start))
+    return sim
+
+
+def build_legacy_animals(count, seed=0):
+    """The same animals as one dict each, the way the spawner used to keep them"""
+    sim = SpawnerSimulation(SCREEN_WIDTH, SCREEN_HEIGHT, rng=random.Random(seed))
+    sim.create_animals(count)
+    animals = sim.animals
+    columns = {name: animals.column(name).tolist() if animals.use_numpy else list(animals.column(name))
+               for name in ('x', 'y', 'size', 'angle', 'bounce_factor')}
+    types, colors, symbols = list(animals.animal_type), list(animals.color), list(animals.symbol)
+    del sim, animals
+    legacy = []
+    for i in range(count):
+        legacy.append({
+            'x': int(columns['x'][i]),
+            'y': int(columns['y'][i]),
+            'speed_x': 0,
+            'speed_y': 0,
+            'size': int(columns['size'][i]),
+            'color': colors[i],
+            'animal_type': types[i],
+            'symbol': symbols[i],
+            'id': None,
+            'angle': columns['angle'][i],
+            'rotation_speed': 0,
+            'bounce_factor': columns['bounce_factor'][i],
+            'eyes': [],
+        })
+    return legacy
+
+
+def traced_bytes(build, *args):
+    """Bytes still allocated after `build(*args)`, with the result kept alive"""
+    gc.collect()
+    tracemalloc.start()
+    result = build(*args)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def memory_report(sizes, seed=0):
+    """Bytes per animal for the old dict-per-animal layout and the column store"""
+    # Spawn in large batches, one at a time is very slow under tracemalloc
+    layouts = {
+        'dicts': lambda count: traced_bytes(build_legacy_animals, count, seed),
+        'store_array': lambda count: traced_bytes(build_simulation, count, seed, False, 10000),
+    }
+    if np is not None:
+        layouts['store_numpy'] = lambda count: traced_bytes(build_simulation, count, seed, True, 10000)
+    report = {}
+    for count in sizes:
+        report[str(count)] = row = {name: measure(count) / count for name, measure in layouts.items()}
+        print(f"{count:>9} animals: " + "  ".join(f"{name} {value:>6.0f} B" for name, value in row.items()))
+    return report
+
+
+def snapshot_report(sizes, path, seed=0):
+    """Seconds to save a crowd to a snapshot and to restore it into a fresh simulation"""
+    report = {}
+    for count in sizes:
+        sim = build_simulation(count, seed, batch=10000)
+        start = time.perf_counter()
+        save_snapshot(sim, path)
+        saved = time.perf_counter() - start
+        restored = SpawnerSimulation(SCREEN_WIDTH, SCREEN_HEIGHT, rng=random.Random())
+        start = time.perf_counter()
+        load_snapshot(restored, path)
+        loaded = time.perf_counter() - start
+        report[str(count)] = {'save_s': saved, 'load_s': loaded, 'file_bytes': os.path.getsize(path)}
+        print(f"{count:>9} animals: save {saved:.3f} s  load {loaded:.3f} s  "
+              f"{os.path.getsize(path) / count:.0f} B/animal on disk")
+        del sim, restored
+    os.remove(path)
+    return report
+
+
+def time_frames(sim, frames):
+    """Average milliseconds for one physics step plus the dirty-set scan"""
+    start = time.perf_counter()
+    for _ in range(frames):
+        sim.update(FRAME_DT)
+        sim.animals.dirty_indices()
+        sim.animals.mark_all_drawn()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def set_random_speeds(animals, rng):
+    for name in ('speed_x', 'speed_y'):
+        column = animals.column(name)
+        for i in range(len(animals)):
+            column[i] = rng.uniform(-200, 200)
+
+
+def time_removals(sim, removals, rng):
+    """Average microseconds to remove one animal, half at random and half by handle.
+
+    Removal swaps the last animal into the hole, so this should stay flat
+    as the crowd grows.
+    """
+    animals = sim.animals
+    handles = [animals.handle(rng.randrange(len(animals))) for _ in range(removals // 2)]
+    start = time.perf_counter()
+    for _ in range(removals - len(handles)):
+        sim.remove_animal()
+    for handle in handles:
+        sim.remove_handle(handle)
+    return (time.perf_counter() - start) / removals * 1e6
+
+
+def time_collisions(count, seed=0, steps=3):
+    """Average microseconds per animal for one grid-based collision pass.
+
+    Animals are scattered over an area that grows with the crowd, so the
+    density stays the same and the result should stay flat if the grid
+    keeps the work linear.
+    """
+    side = int((count * 100 * 100) ** 0.5)  # About one animal per 100x100 px
+    sim = SpawnerSimulation(side, side, rng=random.Random(seed))
+    sim.create_animals(count)
+    rng = random.Random(seed)
+    xs, ys = sim.animals.column('x'), sim.animals.column('y')
+    for i in range(count):
+        xs[i] = rng.uniform(0, side)
+        ys[i] = rng.uniform(0, side)
+    grid = sim.enable_grid()
+    start = time.perf_counter()
+    for _ in range(steps):
+        grid.resolve_collisions()
+    return (time.perf_counter() - start) / steps / count * 1e6
+
+
+def bench_size(count, frames=30, seed=0):
+    """Run every benchmark for one crowd size and return its metrics"""
+    gc.collect()
+    start = time.perf_counter()
+    sim = build_simulation(count, seed)
+    spawn_seconds = time.perf_counter() - start
+
+    update_static_ms = time_frames(sim, frames)
+    set_random_speeds(sim.animals, random.Random(seed))
+    update_moving_ms = time_frames(sim, frames)
+    remove_us = time_removals(sim, min(1000, count // 2), random.Random(seed))
+    del sim
+    collide_us = time_collisions(count, seed)
+
+    # Memory gets its own run, tracemalloc slows everything else down
+    current = traced_bytes(build_simulation, count, seed)
+
+    return {
+        'spawn_per_second': count / spawn_seconds,
+        'update_static_ms': update_static_ms,
+        'update_moving_ms': update_moving_ms,
+        'remove_us': remove_us,
+        'collide_us': collide_us,
+        'bytes_per_animal': current / count,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Describe every metric that is more than `tolerance` worse than the baseline"""
+    regressions = []
+    for size, metrics in results.items():
+        old_metrics = baseline.get(size, {})
+        for name, value in metrics.items():
+            old = old_metrics.get(name)
+            if not old:
+                continue
+            change = (value - old) / old
+            if METRICS[name]:
+                change = -change
+            if change > tolerance:
+                regressions.append(f"{name} at {size} animals: {old:.4g} -> {value:.4g} ({change:+.0%} worse)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the headless spawner core")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--frames', type=int, default=30, help="frames to average update cost over")
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', default='bench_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true', help="write the results to the baseline file too")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown before flagging, 0.2 = 20%%")
+    parser.add_argument('--memory', action='store_true',
+                        help="only compare bytes per animal between dicts and the column store")
+    parser.add_argument('--snapshot', action='store_true', help="only time saving and restoring snapshots")
+    args = parser.parse_args(argv)
+
+    if args.snapshot:
+        report = snapshot_report(args.sizes, args.output + '.snapshot')
+        with open(args.output, 'w') as f:
+            json.dump({'snapshot': report}, f, indent=2)
+        print(f"Wrote {args.output}")
+        return 0
+
+    if args.memory:
+        report = memory_report(args.sizes)
+        with open(args.output, 'w') as f:
+            json.dump({'memory': report}, f, indent=2)
+        print(f"Wrote {args.output}")
+        return 0
+
+    results = {}
+    for count in args.sizes:
+        results[str(count)] = metrics = bench_size(count, args.frames)
+        print(f"{count:>9} animals: {metrics['spawn_per_second']:>10.0f} spawns/s  "
+              f"update {metrics['update_static_ms']:>8.2f} ms static, {metrics['update_moving_ms']:>8.2f} ms moving  "
+              f"remove {metrics['remove_us']:>6.2f} us  collide {metrics['collide_us']:>6.2f} us/animal  "
+              f"{metrics['bytes_per_animal']:>6.0f} B/animal")
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': np.__version__ if np is not None else None,
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print("REGRESSION:", line)
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
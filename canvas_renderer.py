@@ -0,0 +1,192 @@
+from item_pool import CanvasItemPool
+from lod import LodPolicy, LOD_LEVELS, LOD_FULL, LOD_NO_EYES, LOD_MARKER
+from species import default_catalog
+
+
+class CanvasRenderer:
+    """Draws every animal as its own canvas items (body plus two eyes).
+
+    Only animals whose position or size changed since they were last drawn
+    are touched, so a screen full of idle animals costs no canvas calls.
+    `pushed` and `skipped` count the animals updated and left alone in the
+    most recent `sync`. `canvas` may be a `tk.Canvas` or a
+    CanvasCommandBuffer that queues the updates. Items come from a
+    CanvasItemPool, so removed animals are hidden and reused rather than
+    deleted and recreated.
+
+    How much of an animal is drawn follows `lod` (a LodPolicy): small
+    animals lose their eyes and huge crowds become single markers. When the
+    crowd crosses the marker threshold every animal is redrawn at its new
+    level in the next `sync`. `lod_counts` holds how many animals are drawn
+    at each level.
+
+    With `sync_limit` set, at most that many dirty animals are redrawn per
+    `sync`, taking turns, and the rest keep their old position until a
+    later one.
+
+    With `sprites` (a SpriteCache) animals are drawn as pictures sized and
+    tinted like their shapes; species without a usable sprite keep shapes.
+
+    `items_raised` is set whenever items are created or reused, since they
+    land above everything else; whoever keeps an overlay on top clears it.
+    """
+
+    def __init__(self, canvas, sprites=None, pool_ceiling=10000, prefill=0, lod=None, catalog=None):
+        self.canvas = canvas
+        self.sprites = sprites
+        self.sprite_of = {}  # Image item -> the sprite variant it shows
+        self.catalog = catalog if catalog is not None else default_catalog()
+        self.pool = CanvasItemPool(canvas, ceiling=pool_ceiling)
+        self.lod = lod if lod is not None else LodPolicy()
+        self.lod_counts = dict.fromkeys(LOD_LEVELS, 0)
+        self.relevel_pending = False
+        self.items_raised = False  # Items were put on top since the overlay was last raised
+        self.sync_limit = None
+        self.sync_cursor = 0
+        self.pushed = 0
+        self.skipped = 0
+        self.prefill(prefill)
+
+    def prefill(self, count):
+        """Pre-create hidden items for `count` animals of every shape"""
+        if self.sprites is not None:
+            self.pool.prefill('image', count)  # The picture is set when the item is used
+            return
+        self.pool.prefill('oval', count * 3)  # Round bodies plus two eyes each
+        self.pool.prefill('rectangle', count)
+        self.pool.prefill('polygon', count)
+
+    def create_visuals(self, animal_type, x, y, size, color):
+        """Create the canvas items for a new animal, returns (body_id, eyes)"""
+        return self._create_level(self.level_for(animal_type, size), animal_type, x, y, size, color)
+
+    def uses_sprite(self, animal_type):
+        return self.sprites is not None and self.sprites.has_sprite(animal_type)
+
+    def level_for(self, animal_type, size):
+        """Level of detail an animal of `size` should be drawn at"""
+        level = self.lod.level(size)
+        if level == LOD_NO_EYES and self.uses_sprite(animal_type):
+            return LOD_FULL  # The picture has no separate eyes to drop
+        return level
+
+    def _create_level(self, level, animal_type, x, y, size, color):
+        self.lod_counts[level] += 1
+        self.items_raised = True
+        if level == LOD_MARKER:
+            marker = self.lod.marker_size
+            return self.pool.acquire('marker', (x, y, x + marker, y + marker), fill=color, outline=''), ()
+        if self.sprites is not None:
+            sprite = self.sprites.acquire(animal_type, size, color)
+            if sprite is not None:
+                key, image = sprite
+                body_id = self.pool.acquire('image', (x, y), image=image)  # No separate eyes for image
+                self.sprite_of[body_id] = key
+                return body_id, ()
+
+        # Create different shapes based on animal type
+        species = self.catalog[animal_type]
+        body_id = self.pool.acquire(species.kind, species.body_coords(x, y, size),
+                                    fill=color, outline=species.outline, width=2)
+        if level == LOD_NO_EYES:
+            return body_id, ()
+
+        # Add eyes for all animals
+        left, right = species.eye_coords(x, y, size)
+        left_eye = self.pool.acquire('oval', left, fill='black', outline='', width=1)
+        right_eye = self.pool.acquire('oval', right, fill='black', outline='', width=1)
+        return body_id, (left_eye, right_eye)
+
+    def create_visuals_many(self, animal_types, xs, ys, sizes, colors):
+        """Create the canvas items for a batch of animals, returns (body_ids, eyes)"""
+        # Decide marker mode for the crowd this batch makes, the rest catches up in sync
+        if self.lod.update(sum(self.lod_counts.values()) + len(xs)):
+            self.relevel_pending = True
+        body_ids, eyes = [], []
+        create = self.create_visuals
+        for animal_type, x, y, size, color in zip(animal_types, xs, ys, sizes, colors):
+            body_id, animal_eyes = create(animal_type, x, y, size, color)
+            body_ids.append(body_id)
+            eyes.append(animal_eyes)
+        return body_ids, eyes
+
+    def level_of(self, body_id, eyes):
+        """Level of detail an animal is currently drawn at"""
+        kind = self.pool.in_use[body_id]
+        if kind == 'marker':
+            return LOD_MARKER
+        return LOD_FULL if eyes or kind == 'image' else LOD_NO_EYES
+
+    def delete_visuals(self, body_id, eyes):
+        """Hide the canvas items of one animal and return them to the pool"""
+        self.lod_counts[self.level_of(body_id, eyes)] -= 1
+        key = self.sprite_of.pop(body_id, None)
+        if key is not None:
+            self.sprites.release(key)
+        self.pool.release(body_id, *eyes)
+
+    def clear_visuals(self):
+        """Hide the items of every animal in one pass"""
+        self.pool.release_all()
+        self.lod_counts = dict.fromkeys(LOD_LEVELS, 0)
+        if self.sprite_of:
+            self.sprite_of.clear()
+            self.sprites.release_all()
+
+    def relevel(self, animals, index, level):
+        """Redraw the animal at `index` with the items for `level`"""
+        self.delete_visuals(animals.id[index], animals.eyes[index])
+        x, y = animals.column('x')[index], animals.column('y')[index]
+        body_id, eyes = self._create_level(level, animals.animal_type[index], x, y,
+                                           int(animals.column('size')[index]), animals.color[index])
+        animals.set_visuals(index, body_id, eyes)
+        animals.mark_drawn(index)
+
+    def lod_text(self):
+        counts = self.lod_counts
+        return f"lod: {counts[LOD_FULL]} full, {counts[LOD_NO_EYES]} no eyes, {counts[LOD_MARKER]} markers"
+
+    def reset(self):
+        """Called after everything but the pooled items was wiped; nothing to rebuild here"""
+
+    def sync(self, animals):
+        """Update the canvas items of every dirty animal"""
+        if self.lod.update(len(animals)) or self.relevel_pending:
+            # Marker mode flipped: bring every animal to its new level first
+            self.relevel_pending = False
+            sizes, types = animals.column('size'), animals.animal_type
+            for i in range(len(animals)):
+                level = self.level_for(types[i], int(sizes[i]))
+                if level != self.level_of(animals.id[i], animals.eyes[i]):
+                    self.relevel(animals, i, level)
+        dirty = animals.dirty_indices()
+        if self.sync_limit is not None and len(dirty) > self.sync_limit:
+            # Redraw a slice now, the rest stays dirty and gets its turn in the next frames
+            start = self.sync_cursor % len(dirty)
+            dirty = (dirty[start:] + dirty[:start])[:self.sync_limit]
+            self.sync_cursor = start + self.sync_limit
+        xs, ys, sizes = animals.column('x'), animals.column('y'), animals.column('size')
+        for i in dirty:
+            x, y, size = xs[i], ys[i], int(sizes[i])
+            level = self.level_of(animals.id[i], animals.eyes[i])
+            wanted = self.level_for(animals.animal_type[i], size)
+            key = self.sprite_of.get(animals.id[i])
+            if level != wanted or (key is not None and key[1] != self.sprites.size_bucket(size)):
+                self.relevel(animals, i, wanted)
+            elif level == LOD_MARKER:
+                marker = self.lod.marker_size
+                self.canvas.coords(animals.id[i], x, y, x + marker, y + marker)
+            elif key is not None:
+                self.canvas.coords(animals.id[i], x, y)
+            else:
+                # Update main body
+                species = self.catalog[animals.animal_type[i]]
+                self.canvas.coords(animals.id[i], *species.body_coords(x, y, size))
+                # Update eyes
+                if level == LOD_FULL:
+                    left, right = species.eye_coords(x, y, size)
+                    self.canvas.coords(animals.eyes[i][0], *left)
+                    self.canvas.coords(animals.eyes[i][1], *right)
+            animals.mark_drawn(i)
+        self.pushed = len(dirty)
+        self.skipped = len(animals) - self.pushed
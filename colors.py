@@ -1,42 +1,134 @@
+import argparse
+import math
+import time
 import tkinter as tk
 
+from frame_scheduler import FrameScheduler
+from key_input import KeyCoalescer
+
 # List of colors to cycle through
 COLORS = ["green", "red", "blue", "yellow", "pink", "orange", "purple","black", "white"]
 
+
+def color_lut(rgbs, steps):
+    """Per color, the `steps` + 1 hex colors fading from it into the next one"""
+    lut = []
+    for i, (r1, g1, b1) in enumerate(rgbs):
+        r2, g2, b2 = rgbs[(i + 1) % len(rgbs)]
+        lut.append([f"#{r1 + (r2 - r1) * k // steps:02x}{g1 + (g2 - g1) * k // steps:02x}"
+                    f"{b1 + (b2 - b1) * k // steps:02x}" for k in range(steps + 1)])
+    return lut
+
+
 class ColorCycleGame:
-    def __init__(self, root):
+    def __init__(self, root, max_key_rate=None, animate=False, transition_ms=250, target_fps=60,
+                 frame_budget=0.25, on_quit=None):
         self.root = root
+        self.on_quit = on_quit  # Called instead of closing the window, see launcher.py
         self.index = 0
         self.fullscreen = False  # track fullscreen state
         self.root.title("Color Cycle Game")
         self.root.geometry("600x400")
-        self.root.configure(bg=COLORS[self.index])
+
+        # Color names are resolved once; the window is only given hex colors from the table
+        rgbs = [tuple(c >> 8 for c in root.winfo_rgb(name)) for name in COLORS]
+        self.transition = transition_ms / 1000
+        self.lut = color_lut(rgbs, max(1, round(self.transition * target_fps)))
+        self.shown = self.lut[self.index][0]
+        self.root.configure(bg=self.shown)
         # Removed text label; now the window just shows the color.
 
-        # Key bindings
-        root.bind("<space>", self.next_color)
-        root.bind("<Right>", self.next_color)
-        root.bind("<Return>", self.next_color)
-        root.bind("<Left>", self.prev_color)
-        root.bind("q", self.quit)
-        root.bind("Q", self.quit)
-        root.bind("<Escape>", self.exit_fullscreen_or_quit)
-        root.bind("f", self.toggle_fullscreen)
-        root.bind("F", self.toggle_fullscreen)
+        # Animated mode fades between colors on a paced timer
+        self.animate = animate
+        self.scheduler = FrameScheduler(root, self.animate_frame, target_fps)
+        self.animating = False
+        self.position = float(self.index)  # Where the fade is, counted in colors along COLORS
+        self.target = self.index  # Where it is heading, not wrapped around
+        self.frame_budget = frame_budget  # Share of the frame period a fade frame may take
+        self.frame_cost = 0.0  # Moving average, in seconds
+        self.max_frame_cost = 0.0
+        self.frames = 0
+
+        # Presses are folded into one color change per frame
+        self.keys = KeyCoalescer(root, self.shift_color, max_rate=max_key_rate)
+        self.key_stats = max_key_rate is not None  # Report dropped presses on close
+
+        # Key bindings, with their ids so close() can take them off the shared window
+        self.bindings = [(sequence, root.bind(sequence, callback)) for sequence, callback in (
+            ("<space>", self.next_color),
+            ("<Right>", self.next_color),
+            ("<Return>", self.next_color),
+            ("<Left>", self.prev_color),
+            ("q", self.quit),
+            ("Q", self.quit),
+            ("<Escape>", self.exit_fullscreen_or_quit),
+            ("f", self.toggle_fullscreen),
+            ("F", self.toggle_fullscreen),
+        )]
 
     # Removed _label_text method
 
     def _apply_color(self):
-        color = COLORS[self.index]
-        self.root.configure(bg=color)
+        self.shown = self.lut[self.index][0]
+        self.root.configure(bg=self.shown)
+
+    def shift_color(self, steps):
+        self.index = (self.index + steps) % len(COLORS)
+        if not self.animate:
+            self._apply_color()
+            return
+        # A fade already running just heads for the new target
+        self.target += steps
+        if not self.animating:
+            self.animating = True
+            self.scheduler.start()
+
+    def animate_frame(self):
+        """One frame of the fade towards the target color"""
+        started = time.perf_counter()
+        steps = self.scheduler.begin_frame()
+        remaining = self.target - self.position
+        # One color per transition, faster while several presses are still ahead
+        move = steps * self.scheduler.timestep * max(1.0, abs(remaining)) / self.transition
+        if move >= abs(remaining):
+            self.position = self.target
+        else:
+            self.position += move if remaining > 0 else -move
+        segment = math.floor(self.position)
+        fade = self.lut[segment % len(COLORS)]
+        color = fade[round((self.position - segment) * (len(fade) - 1))]
+        if color != self.shown:
+            self.root.configure(bg=color)
+            self.root.update_idletasks()  # Repaint now, so it counts towards the frame cost
+            self.shown = color
+        self.measure(time.perf_counter() - started)
+
+        if self.position == self.target:
+            self.position = self.target = self.index
+            self.animating = False
+            return
+        self.scheduler.end_frame()
+
+    def measure(self, cost):
+        """Track the frame cost and lower the frame rate while it is over budget"""
+        self.frames += 1
+        self.max_frame_cost = max(self.max_frame_cost, cost)
+        self.frame_cost += (cost - self.frame_cost) * 0.1
+        target_fps = self.scheduler.target_fps
+        if self.frame_cost > self.frame_budget / target_fps and target_fps > 15:
+            # Fewer, bigger steps: the fade keeps its length and takes less of each frame
+            self.scheduler.set_target_fps(target_fps / 2)
+            print(f"Fading at {target_fps / 2:.0f} fps, frames took {self.frame_cost * 1000:.2f} ms")
+
+    def stats_text(self):
+        return (f"fade: {self.frames} frames at {self.scheduler.target_fps:.0f} fps, "
+                f"{self.frame_cost * 1000:.2f} ms average, {self.max_frame_cost * 1000:.2f} ms max")
 
     def next_color(self, event=None):
-        self.index = (self.index + 1) % len(COLORS)
-        self._apply_color()
+        self.keys.push(1)
 
     def prev_color(self, event=None):
-        self.index = (self.index - 1) % len(COLORS)
-        self._apply_color()
+        self.keys.push(-1)
 
     def toggle_fullscreen(self, event=None):
         self.fullscreen = not self.fullscreen
@@ -59,13 +151,33 @@ class ColorCycleGame:
         else:
             self.quit()
 
+    def close(self):
+        """Stop the fade and take the key bindings off the window"""
+        self.keys.cancel()
+        self.scheduler.stop()
+        self.animating = False
+        if self.key_stats:
+            print(self.keys.stats_text())  # Debug output
+        if self.animate:
+            print(self.stats_text())
+        for sequence, funcid in self.bindings:
+            self.root.unbind(sequence, funcid)
+
     def quit(self, event=None):
-        self.root.destroy()
+        self.close()
+        if self.on_quit is not None:
+            self.on_quit()
+        else:
+            self.root.destroy()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Color Cycle Game")
+    parser.add_argument('--animate', action='store_true', help="fade between colors instead of jumping")
+    parser.add_argument('--transition-ms', type=int, default=250, help="length of one fade")
+    args = parser.parse_args()
     root = tk.Tk()
-    ColorCycleGame(root)
+    ColorCycleGame(root, animate=args.animate, transition_ms=args.transition_ms)
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+from collections import deque
+
+from entity_store import np
+
+
+class OldestFirst:
+    """Evict the animals that were spawned longest ago"""
+
+    def __init__(self):
+        self.order = deque()  # Handles in spawn order, removed animals are skipped lazily
+
+    def added(self, sim, start, count):
+        handle = sim.animals.handle
+        self.order.extend(handle(i) for i in range(start, start + count))
+
+    def cleared(self):
+        self.order.clear()
+
+    def evict(self, sim, count):
+        evicted = 0
+        while evicted < count and self.order:
+            if sim.remove_handle(self.order.popleft()):
+                evicted += 1
+        return evicted
+
+
+class RandomEviction:
+    """Evict animals picked at random, exactly like `remove_animal`"""
+
+    def added(self, sim, start, count):
+        pass
+
+    def cleared(self):
+        pass
+
+    def evict(self, sim, count):
+        count = min(count, len(sim.animals))
+        for _ in range(count):
+            sim.remove_animal()
+        return count
+
+
+class OffscreenFirst(RandomEviction):
+    """Evict animals nobody can see first, then random ones.
+
+    Off-screen means the whole body is outside `view` (width, height), the
+    visible part of the canvas, which defaults to the simulation area.
+    Next come animals whose body is completely covered by a bigger one,
+    found by checking up to `samples_per_eviction` random animals per
+    eviction against the simulation's spatial grid (if it has one).
+    """
+
+    def __init__(self, view=None, samples_per_eviction=4):
+        self.view = view
+        self.samples_per_eviction = samples_per_eviction
+
+    def offscreen_handles(self, sim, limit):
+        animals = sim.animals
+        width, height = self.view or (sim.width, sim.height)
+        xs, ys, sizes = animals.column('x'), animals.column('y'), animals.column('size')
+        if animals.use_numpy:
+            half = sizes / 2
+            outside = (xs + half < 0) | (xs - half > width) | (ys + half < 0) | (ys - half > height)
+            indices = np.flatnonzero(outside)[:limit].tolist()
+        else:
+            indices = []
+            for i in range(len(animals)):
+                half = sizes[i] / 2
+                if xs[i] + half < 0 or xs[i] - half > width or ys[i] + half < 0 or ys[i] - half > height:
+                    indices.append(i)
+                    if len(indices) == limit:
+                        break
+        return [animals.handle(i) for i in indices]
+
+    def occluded_handles(self, sim, limit):
+        grid, animals = sim.grid, sim.animals
+        if grid is None or not animals:
+            return []
+        xs, ys, sizes = animals.column('x'), animals.column('y'), animals.column('size')
+        found = set()
+        for _ in range(limit * self.samples_per_eviction):
+            i = animals.random_index(sim.rng)
+            x, y, radius = xs[i], ys[i], sizes[i] / 2
+            for other in grid.query_radius(x, y, grid.cell_size / 2):
+                j = animals.index(other)
+                if j == i:
+                    continue
+                dx, dy = xs[j] - x, ys[j] - y
+                cover = sizes[j] / 2 - radius
+                if cover >= 0 and dx * dx + dy * dy <= cover * cover:
+                    found.add(animals.handle(i))
+                    break
+            if len(found) == limit:
+                break
+        return list(found)
+
+    def evict(self, sim, count):
+        evicted = 0
+        for handle in self.offscreen_handles(sim, count):
+            evicted += sim.remove_handle(handle)
+        if evicted < count:
+            for handle in self.occluded_handles(sim, count - evicted):
+                evicted += sim.remove_handle(handle)
+        if evicted < count:
+            evicted += RandomEviction.evict(self, sim, count - evicted)
+        return evicted
+
+
+EVICTION_POLICIES = {
+    'oldest': OldestFirst,
+    'random': RandomEviction,
+    'offscreen': OffscreenFirst,
+}
+
+
+class EntityBudget:
+    """Caps how many animals a simulation keeps, by count and by estimated memory.
+
+    The limit is the smaller of `max_count` and `max_bytes` divided by
+    `bytes_per_animal` (a rough estimate covering the store, the grid and
+    the canvas items). `make_room` evicts through `policy` so that the
+    animals about to be spawned fit, and returns how many of them may be
+    spawned. `rate` is the evictions per second over the last
+    `rate_window` seconds of simulated time.
+    """
+
+    def __init__(self, max_count=None, max_bytes=None, policy='oldest', bytes_per_animal=1500,
+                 rate_window=1.0):
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+        self.bytes_per_animal = bytes_per_animal
+        self.policy = EVICTION_POLICIES[policy]() if isinstance(policy, str) else policy
+        self.evicted = 0
+        self.rate = 0.0
+        self.rate_window = rate_window
+        self.window_evicted = 0
+        self.window_time = 0.0
+
+    @property
+    def limit(self):
+        limits = []
+        if self.max_count is not None:
+            limits.append(self.max_count)
+        if self.max_bytes is not None:
+            limits.append(self.max_bytes // self.bytes_per_animal)
+        return min(limits) if limits else None
+
+    def make_room(self, sim, incoming, dt):
+        """Evict so `incoming` new animals fit, returns how many can be spawned"""
+        limit = self.limit
+        evicted = 0
+        if limit is not None:
+            incoming = min(incoming, limit)
+            excess = len(sim.animals) + incoming - limit
+            if excess > 0:
+                evicted = self.policy.evict(sim, excess)
+        self.evicted += evicted
+        self.window_evicted += evicted
+        self.window_time += dt
+        if self.window_time >= self.rate_window:
+            self.rate = self.window_evicted / self.window_time
+            self.window_evicted = 0
+            self.window_time = 0.0
+        return incoming
+
+    def stats_text(self):
+        return f"budget: {self.limit} animals, {self.evicted} evicted ({self.rate:.0f}/s)"
@@ -0,0 +1,482 @@
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Per-animal numeric state, one contiguous column each
+FLOAT_COLUMNS = ('x', 'y', 'speed_x', 'speed_y', 'size', 'angle', 'rotation_speed', 'bounce_factor')
+
+# Float columns that only need single precision (never used for drawing)
+SINGLE_COLUMNS = ('angle', 'rotation_speed', 'bounce_factor')
+
+# Position and size as last pushed to the canvas, used to find changed animals
+DRAWN_COLUMNS = ('drawn_x', 'drawn_y', 'drawn_size')
+
+# Per-animal names and colors, stored as small codes into a shared table
+INTERNED_COLUMNS = ('color', 'animal_type', 'symbol')
+
+# Per-animal values that are not numbers (canvas ids)
+OBJECT_COLUMNS = ('id', 'eyes')
+
+# Animals are never pushed above this line (the instructions live there)
+TOP_MARGIN = 100
+
+# A handle packs a slot number into the low bits and the slot's generation above it
+SLOT_BITS = 32
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class InternedColumn:
+    """List-like column that stores each distinct value once.
+
+    Every row holds a 2-byte code into `values`, so a million animals that
+    share ten species names cost 2 MB instead of a million pointers.
+    """
+
+    def __init__(self):
+        self.codes = array('H')
+        self.values = []
+        self.code_of = {}
+
+    def intern(self, value):
+        code = self.code_of.get(value)
+        if code is None:
+            code = self.code_of[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            values = self.values
+            return [values[code] for code in self.codes[index]]
+        return self.values[self.codes[index]]
+
+    def __setitem__(self, index, value):
+        self.codes[index] = self.intern(value)
+
+    def __iter__(self):
+        values = self.values
+        return (values[code] for code in self.codes)
+
+    def append(self, value):
+        self.codes.append(self.intern(value))
+
+    def extend(self, values):
+        intern = self.intern
+        self.codes.extend(intern(value) for value in values)
+
+    def extend_codes(self, codes, values):
+        """Append rows given as codes into another table, `values`, such as a saved column"""
+        mapping = [self.intern(value) for value in values]
+        if mapping != list(range(len(mapping))):
+            if np is not None:
+                codes = np.array(mapping, dtype=np.uint16)[np.asarray(codes)]
+            else:
+                codes = array('H', (mapping[code] for code in codes))
+        self.codes.frombytes(memoryview(codes).cast('B'))
+
+    def pop(self):
+        return self.values[self.codes.pop()]
+
+    def clear(self):
+        # Keep the table, the same names and colors come back after a reset
+        self.codes = array('H')
+
+
+class EntityStore:
+    """Struct-of-arrays storage for all animals on screen.
+
+    Every attribute lives in its own column so that the physics step runs
+    over whole columns at once instead of looping over per-animal dicts.
+    NumPy arrays are used when available, plain `array('d')` otherwise.
+    Angle, rotation and bounce are single precision, and names and colors
+    are interned (see InternedColumn), which keeps a static animal at about
+    a hundred bytes. Removal swaps the last animal into the freed slot, so indices are not
+    stable across `remove` calls.
+
+    Every animal also gets an integer handle that stays valid until it is
+    removed. Handles index a slot table (slot -> row) and carry the slot's
+    generation, so a handle to a removed animal never resolves to the animal
+    that later reuses its slot. `find_by_item` maps a canvas item id back to
+    the handle of the animal that owns it.
+    """
+
+    def __init__(self, capacity=1024, use_numpy=None):
+        if use_numpy is None:
+            use_numpy = np is not None
+        self.use_numpy = use_numpy and np is not None
+        self.count = 0
+        self.capacity = max(1, capacity) if self.use_numpy else 0
+        for name in FLOAT_COLUMNS + DRAWN_COLUMNS:
+            setattr(self, '_' + name, self._allocate(self.capacity, name))
+        for name in INTERNED_COLUMNS:
+            setattr(self, name, InternedColumn())
+        for name in OBJECT_COLUMNS:
+            setattr(self, name, [])
+        self._reset_handles()
+
+    def _reset_handles(self):
+        self._handle = array('q')  # row -> handle
+        self._slot_row = array('q')  # slot -> row, -1 while the slot is free
+        self._slot_generation = array('L')
+        self._free_slots = []
+        self._item_owner = {}  # canvas item id -> handle
+        self._unresolved_items = []  # (item, handle) whose canvas id is not known yet
+        self._resolve_at = 4096  # Length at which the list above is resolved without waiting for a flush
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def _allocate(self, capacity, name):
+        typecode = 'f' if name in SINGLE_COLUMNS else 'd'
+        if self.use_numpy:
+            return np.zeros(capacity, dtype=typecode)
+        return array(typecode)
+
+    def _grow(self, needed):
+        """Double the NumPy columns until `needed` rows fit"""
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in FLOAT_COLUMNS + DRAWN_COLUMNS:
+            old = getattr(self, '_' + name)
+            new = self._allocate(capacity, name)
+            new[:self.count] = old[:self.count]
+            setattr(self, '_' + name, new)
+        self.capacity = capacity
+
+    def column(self, name):
+        """Return a live view of the first `count` values of a float column"""
+        data = getattr(self, '_' + name)
+        if self.use_numpy:
+            return data[:self.count]
+        return data
+
+    def bind_column(self, name, data):
+        """Keep float column `name` in the NumPy array `data` from now on.
+
+        `data` must hold at least `capacity` values and already contain the
+        current ones, e.g. a view of a buffer a physics worker published.
+        Growing the store moves the column back into memory of its own.
+        """
+        setattr(self, '_' + name, data)
+
+    def append(self, x, y, size, color, animal_type, symbol, body_id, eyes,
+               angle=0.0, bounce_factor=1.0, speed_x=0.0, speed_y=0.0, rotation_speed=0.0):
+        """Add one animal and return its index"""
+        index = self.count
+        # Visuals are created in place, so the new animal starts out clean
+        values = (x, y, speed_x, speed_y, size, angle, rotation_speed, bounce_factor, x, y, size)
+        if self.use_numpy:
+            if index >= self.capacity:
+                self._grow(index + 1)
+            for name, value in zip(FLOAT_COLUMNS + DRAWN_COLUMNS, values):
+                getattr(self, '_' + name)[index] = value
+        else:
+            for name, value in zip(FLOAT_COLUMNS + DRAWN_COLUMNS, values):
+                getattr(self, '_' + name).append(value)
+        self.color.append(color)
+        self.animal_type.append(animal_type)
+        self.symbol.append(symbol)
+        self.id.append(body_id)
+        self.eyes.append(eyes)
+        self._handle.append(self._new_handle(index, body_id, eyes))
+        self.count += 1
+        return index
+
+    def extend(self, xs, ys, sizes, colors, animal_types, symbols, body_ids, eyes, angles, bounce_factors):
+        """Append a batch of animals at once and return the index of the first.
+
+        Every argument is a sequence with one entry per new animal; speeds and
+        rotation start at 0.
+        """
+        start = self.count
+        n = len(xs)
+        zeros = [0.0] * n
+        values = (xs, ys, zeros, zeros, sizes, angles, zeros, bounce_factors, xs, ys, sizes)
+        if self.use_numpy:
+            if start + n > self.capacity:
+                self._grow(start + n)
+            for name, value in zip(FLOAT_COLUMNS + DRAWN_COLUMNS, values):
+                getattr(self, '_' + name)[start:start + n] = value
+        else:
+            for name, value in zip(FLOAT_COLUMNS + DRAWN_COLUMNS, values):
+                getattr(self, '_' + name).extend(value)
+        self.color.extend(colors)
+        self.animal_type.extend(animal_types)
+        self.symbol.extend(symbols)
+        self.id.extend(body_ids)
+        self.eyes.extend(eyes)
+        self._add_handles(start, n, body_ids, eyes)
+        self.count += n
+        return start
+
+    def extend_columns(self, floats, interned, body_ids, eyes):
+        """Append a batch given as whole columns and return the index of the first.
+
+        `floats` maps every name in FLOAT_COLUMNS to the batch's values (a
+        NumPy array or an array of the column's type code), and `interned`
+        maps every name in INTERNED_COLUMNS to (codes, values), the codes
+        and the table they index. This is the bulk path snapshots load through.
+        """
+        start = self.count
+        n = len(body_ids)
+        drawn = {'drawn_x': floats['x'], 'drawn_y': floats['y'], 'drawn_size': floats['size']}
+        if self.use_numpy and start + n > self.capacity:
+            self._grow(start + n)
+        for name in FLOAT_COLUMNS + DRAWN_COLUMNS:
+            values = floats[name] if name in floats else drawn[name]
+            if self.use_numpy:
+                getattr(self, '_' + name)[start:start + n] = values
+            else:
+                getattr(self, '_' + name).extend(values)
+        for name in INTERNED_COLUMNS:
+            getattr(self, name).extend_codes(*interned[name])
+        self.id.extend(body_ids)
+        self.eyes.extend(eyes)
+        self._add_handles(start, n, body_ids, eyes)
+        self.count += n
+        return start
+
+    def _add_handles(self, start, n, body_ids, eyes):
+        """Give rows start..start+n handles, reusing free slots first (newest first)"""
+        free = self._free_slots
+        reused = free[:len(free) - n - 1 if n < len(free) else None:-1]
+        del free[len(free) - len(reused):]
+        slot_row, generation = self._slot_row, self._slot_generation
+        for row, slot in zip(range(start, start + len(reused)), reused):
+            slot_row[slot] = row
+        self._handle.extend([generation[slot] << SLOT_BITS | slot for slot in reused])
+        # Fresh slots for the rest: fill the slot table in bulk
+        fresh = n - len(reused)
+        first_slot = len(slot_row)
+        generation.frombytes(bytes(fresh * generation.itemsize))
+        if np is not None:
+            slot_row.frombytes(np.arange(start + len(reused), start + n, dtype=np.int64).tobytes())
+            self._handle.frombytes(np.arange(first_slot, first_slot + fresh, dtype=np.int64).tobytes())
+        else:
+            slot_row.extend(range(start + len(reused), start + n))
+            self._handle.extend(range(first_slot, first_slot + fresh))
+        if body_ids.count(None) == n and eyes.count(()) == n:
+            return  # No canvas items to track
+        handles = self._handle
+        for row, body_id, animal_eyes in zip(range(start, start + n), body_ids, eyes):
+            if body_id is not None or animal_eyes:
+                self._track_items(handles[row], body_id, animal_eyes)
+
+    def remove(self, index):
+        """Remove the animal at `index` by moving the last animal into its slot"""
+        last = self.count - 1
+        if index < 0 or index > last:
+            raise IndexError("entity index out of range")
+        self._free_handle(self._handle[index], self.id[index], self.eyes[index])
+        if index != last:
+            for name in FLOAT_COLUMNS + DRAWN_COLUMNS:
+                data = getattr(self, '_' + name)
+                data[index] = data[last]
+            for name in INTERNED_COLUMNS:
+                codes = getattr(self, name).codes
+                codes[index] = codes[last]
+            for name in OBJECT_COLUMNS:
+                data = getattr(self, name)
+                data[index] = data[last]
+            moved = self._handle[index] = self._handle[last]
+            self._slot_row[moved & SLOT_MASK] = index
+        self._handle.pop()
+        if not self.use_numpy:
+            for name in FLOAT_COLUMNS + DRAWN_COLUMNS:
+                getattr(self, '_' + name).pop()
+        for name in INTERNED_COLUMNS + OBJECT_COLUMNS:
+            getattr(self, name).pop()
+        self.count = last
+
+    def clear(self):
+        """Drop every animal, keeping the allocated NumPy capacity"""
+        if not self.use_numpy:
+            for name in FLOAT_COLUMNS + DRAWN_COLUMNS:
+                setattr(self, '_' + name, self._allocate(0, name))
+        for name in INTERNED_COLUMNS + OBJECT_COLUMNS:
+            getattr(self, name).clear()
+        # Bump every generation so no handle handed out so far resolves again
+        generations = array('L', ((g + 1) & SLOT_MASK for g in self._slot_generation))
+        slots = len(generations)
+        self._reset_handles()
+        self._slot_generation = generations
+        self._slot_row = array('q', [-1]) * slots
+        self._free_slots = list(range(slots - 1, -1, -1))
+        self.count = 0
+
+    def _new_handle(self, row, body_id, eyes):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._slot_row[slot] = row
+        else:
+            slot = len(self._slot_row)
+            self._slot_row.append(row)
+            self._slot_generation.append(0)
+        handle = self._slot_generation[slot] << SLOT_BITS | slot
+        self._track_items(handle, body_id, eyes)
+        return handle
+
+    def _free_handle(self, handle, body_id, eyes):
+        slot = handle & SLOT_MASK
+        self._slot_row[slot] = -1
+        self._slot_generation[slot] = (self._slot_generation[slot] + 1) & SLOT_MASK
+        self._free_slots.append(slot)
+        self._forget_items(handle, body_id, eyes)
+
+    def _forget_items(self, handle, body_id, eyes):
+        for item in [body_id] + list(eyes):
+            item_id = getattr(item, 'id', item)
+            if item_id is not None and self._item_owner.get(item_id) == handle:
+                del self._item_owner[item_id]
+
+    def _track_items(self, handle, body_id, eyes):
+        for item in ([body_id] if body_id is not None else []) + list(eyes):
+            item_id = getattr(item, 'id', item)
+            if item_id is not None:
+                self._item_owner[item_id] = handle
+            else:
+                self._unresolved_items.append((item, handle))
+        if len(self._unresolved_items) > self._resolve_at:
+            self.resolve_items()  # In case nobody flushes and resolves, keep the list bounded
+
+    def set_visuals(self, index, body_id, eyes):
+        """Replace the canvas items of the animal at `index`"""
+        handle = self._handle[index]
+        self._forget_items(handle, self.id[index], self.eyes[index])
+        self.id[index] = body_id
+        self.eyes[index] = eyes
+        self._track_items(handle, body_id, eyes)
+
+    def handle(self, index):
+        """Stable handle of the animal currently at `index`"""
+        return self._handle[index]
+
+    def index(self, handle):
+        """Current index of the animal with `handle`, or None if it was removed"""
+        slot = handle & SLOT_MASK
+        if slot >= len(self._slot_row) or self._slot_generation[slot] != handle >> SLOT_BITS:
+            return None
+        row = self._slot_row[slot]
+        return row if row >= 0 else None
+
+    def random_index(self, rng):
+        """Index of a uniformly chosen animal, in constant time"""
+        return rng.randrange(self.count)
+
+    def resolve_items(self):
+        """Index the items whose canvas id is known by now, dropping those of removed animals"""
+        if self._unresolved_items:
+            waiting = []
+            for item, handle in self._unresolved_items:
+                resolved = getattr(item, 'id', item)
+                if resolved is None:
+                    waiting.append((item, handle))
+                elif self.index(handle) is not None:
+                    self._item_owner[resolved] = handle
+            self._unresolved_items = waiting
+        self._resolve_at = max(4096, 2 * len(self._unresolved_items))
+
+    def find_by_item(self, item_id):
+        """Handle of the animal that owns canvas item `item_id`, or None.
+
+        Items created through a CanvasCommandBuffer only learn their id when
+        the buffer is flushed; `resolve_items` indexes them, after every
+        flush or at the latest on the next lookup.
+        """
+        self.resolve_items()
+        handle = self._item_owner.get(item_id)
+        if handle is None or self.index(handle) is None:
+            return None
+        return handle
+
+    def dirty_indices(self):
+        """Indices of animals whose position or size changed since they were drawn"""
+        if self.use_numpy:
+            changed = self.column('x') != self.column('drawn_x')
+            changed |= self.column('y') != self.column('drawn_y')
+            changed |= self.column('size') != self.column('drawn_size')
+            return np.flatnonzero(changed).tolist()
+        x, y, size = self._x, self._y, self._size
+        drawn_x, drawn_y, drawn_size = self._drawn_x, self._drawn_y, self._drawn_size
+        return [i for i in range(self.count)
+                if x[i] != drawn_x[i] or y[i] != drawn_y[i] or size[i] != drawn_size[i]]
+
+    def mark_drawn(self, index):
+        """Record the current position and size of `index` as what is on screen"""
+        self._drawn_x[index] = self._x[index]
+        self._drawn_y[index] = self._y[index]
+        self._drawn_size[index] = self._size[index]
+
+    def mark_all_drawn(self):
+        """Record every animal as drawn at its current position and size"""
+        n = self.count
+        for name in ('x', 'y', 'size'):
+            getattr(self, '_drawn_' + name)[:n] = getattr(self, '_' + name)[:n]
+
+    def moving_indices(self):
+        """Indices of the animals with a nonzero speed"""
+        if self.use_numpy:
+            return np.flatnonzero((self.column('speed_x') != 0) | (self.column('speed_y') != 0)).tolist()
+        speed_x, speed_y = self._speed_x, self._speed_y
+        return [i for i in range(self.count) if speed_x[i] or speed_y[i]]
+
+    def step(self, dt, width, height):
+        """Integrate, bounce and clamp every animal in one batched pass"""
+        if self.count == 0:
+            return
+        if self.use_numpy:
+            self._step_numpy(dt, width, height)
+        else:
+            self._step_array(dt, width, height)
+
+    def _step_numpy(self, dt, width, height):
+        x, y = self.column('x'), self.column('y')
+        speed_x, speed_y = self.column('speed_x'), self.column('speed_y')
+        bounce = self.column('bounce_factor')
+        half = np.floor_divide(self.column('size'), 2)
+
+        x += speed_x * dt
+        y += speed_y * dt
+        angle = self.column('angle')
+        angle += self.column('rotation_speed') * dt
+
+        # Bounce off walls with each animal's own bounce factor
+        hit_x = (x <= half) | (x >= width - half)
+        speed_x[hit_x] *= -bounce[hit_x]
+        hit_y = (y <= TOP_MARGIN) | (y >= height - half)
+        speed_y[hit_y] *= -bounce[hit_y]
+
+        # Keep within bounds (min first, then max, like the scalar version)
+        np.minimum(x, width - half, out=x)
+        np.maximum(x, half, out=x)
+        np.minimum(y, height - half, out=y)
+        np.maximum(y, TOP_MARGIN, out=y)
+
+    def _step_array(self, dt, width, height):
+        x, y = self._x, self._y
+        speed_x, speed_y = self._speed_x, self._speed_y
+        size, bounce = self._size, self._bounce_factor
+        angle, rotation = self._angle, self._rotation_speed
+        for i in range(self.count):
+            half = size[i] // 2
+            px = x[i] + speed_x[i] * dt
+            py = y[i] + speed_y[i] * dt
+            angle[i] += rotation[i] * dt
+
+            if px <= half or px >= width - half:
+                speed_x[i] *= -bounce[i]
+            if py <= TOP_MARGIN or py >= height - half:
+                speed_y[i] *= -bounce[i]
+
+            x[i] = max(half, min(width - half, px))
+            y[i] = max(TOP_MARGIN, min(height - half, py))
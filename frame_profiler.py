@@ -0,0 +1,133 @@
+import csv
+import json
+import time
+from collections import deque
+
+
+class _NullPhase:
+    """Context manager that does nothing, handed out while profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = self.profiler.clock()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.name, self.profiler.clock() - self.start)
+        return False
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+class FrameProfiler:
+    """Times the phases of each frame and keeps a rolling window per phase.
+
+    Wrap each phase in `with profiler.phase('name'):` between
+    `begin_frame()` and `end_frame()`. While `enabled` is False, `phase`
+    returns a shared no-op context manager and nothing is recorded, so the
+    hooks can stay in the game loop permanently. With a `log_path`, every
+    frame's timings are also kept and written by `dump()` as CSV or JSONL
+    (picked from the file extension). Only the last `log_limit` frames
+    are kept (ten minutes at 60 fps by default); `frame_index` still
+    counts from the first frame, so a gap at the start shows what was
+    dropped.
+    """
+
+    def __init__(self, history=600, log_path=None, log_limit=36000, clock=time.perf_counter):
+        self.history = history
+        self.log_path = log_path
+        self.clock = clock
+        self.enabled = log_path is not None
+        self.samples = {}  # phase name -> deque of durations in seconds
+        self.frame = None
+        self.frame_start = 0.0
+        self.records = deque(maxlen=log_limit)
+        self.logged = 0  # Frames recorded for the log, including the ones dropped off the front
+
+    def phase(self, name):
+        """Context manager that times one phase of the current frame"""
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def add(self, name, duration):
+        """Record `duration` seconds for phase `name` in the current frame"""
+        if self.frame is not None:
+            self.frame[name] = self.frame.get(name, 0.0) + duration
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame = {}
+            self.frame_start = self.clock()
+
+    def end_frame(self):
+        if self.frame is None:
+            return
+        self.frame['frame'] = self.clock() - self.frame_start
+        for name, duration in self.frame.items():
+            if name not in self.samples:
+                self.samples[name] = deque(maxlen=self.history)
+            self.samples[name].append(duration)
+        if self.log_path is not None:
+            self.records.append(self.frame)
+            self.logged += 1
+        self.frame = None
+
+    def stats(self, name):
+        """p50/p95/p99/max in milliseconds over the rolling window of a phase"""
+        values = sorted(self.samples.get(name, ()))
+        return {
+            'p50': percentile(values, 0.50) * 1000,
+            'p95': percentile(values, 0.95) * 1000,
+            'p99': percentile(values, 0.99) * 1000,
+            'max': (values[-1] if values else 0.0) * 1000,
+        }
+
+    def summary_lines(self):
+        """One formatted line per phase, for an on-screen overlay"""
+        lines = [f"{'phase':<10}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  ms"]
+        for name in self.samples:
+            s = self.stats(name)
+            lines.append(f"{name:<10}{s['p50']:>8.2f}{s['p95']:>8.2f}{s['p99']:>8.2f}{s['max']:>8.2f}")
+        return lines
+
+    def dump(self):
+        """Write the per-frame timings to `log_path` (.csv, otherwise JSONL)"""
+        if self.log_path is None or not self.records:
+            return
+        first = self.logged - len(self.records)
+        names = []
+        for record in self.records:
+            names.extend(name for name in record if name not in names)
+        with open(self.log_path, 'w', newline='') as f:
+            if self.log_path.endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=['frame_index'] + names)
+                writer.writeheader()
+                for index, record in enumerate(self.records, first):
+                    writer.writerow(dict(record, frame_index=index))
+            else:
+                for index, record in enumerate(self.records, first):
+                    f.write(json.dumps(dict(record, frame_index=index)) + '\n')
+        print(f"Wrote {len(self.records)} frame timings to {self.log_path}")
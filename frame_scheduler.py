@@ -0,0 +1,88 @@
+import math
+import time
+
+
+class FrameScheduler:
+    """Fixed-timestep frame pacing for a loop driven by Tk's `after`.
+
+    The frame callback calls `begin_frame()` to learn how many fixed
+    simulation steps of `timestep` seconds to run, and `end_frame()` to
+    schedule the next frame. Elapsed time goes into an accumulator read
+    from a monotonic clock, so the simulation advances at the same rate
+    however long frames take. At most `max_steps` steps run per frame;
+    time beyond that is dropped instead of snowballing into ever longer
+    frames. Frames are paced against absolute deadlines one period apart,
+    and the `after` delay is whatever is left of the current frame budget.
+    """
+
+    def __init__(self, root, callback, target_fps=60, max_steps=5, clock=time.monotonic):
+        self.root = root
+        self.callback = callback
+        self.clock = clock
+        self.max_steps = max_steps
+        self.set_target_fps(target_fps)
+        self.after_id = None
+        self.accumulator = 0.0
+        self.last_tick = None
+        self.deadline = None
+
+        # Reporting
+        self.fps = 0.0
+        self.frames = 0
+        self.missed_deadlines = 0
+        self.dropped_steps = 0
+        self.window_start = None
+        self.window_frames = 0
+
+    def set_target_fps(self, target_fps):
+        """Change the frame and simulation rate"""
+        self.target_fps = target_fps
+        self.timestep = 1.0 / target_fps
+
+    def start(self):
+        """Run the first frame right away"""
+        now = self.clock()
+        self.last_tick = now
+        self.deadline = now
+        self.window_start = now
+        self.accumulator = self.timestep  # so the first frame simulates one step
+        self.callback()
+
+    def stop(self):
+        """Cancel the pending frame, if any"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def begin_frame(self):
+        """Account for elapsed time and return how many fixed steps to simulate"""
+        now = self.clock()
+        self.accumulator += now - self.last_tick
+        self.last_tick = now
+
+        steps = min(int(self.accumulator / self.timestep), self.max_steps)
+        self.accumulator -= steps * self.timestep
+        if self.accumulator >= self.timestep:
+            # Too far behind: drop the backlog rather than spiral
+            dropped = int(self.accumulator / self.timestep)
+            self.dropped_steps += dropped
+            self.accumulator -= dropped * self.timestep
+
+        self.frames += 1
+        self.window_frames += 1
+        if now - self.window_start >= 1.0:
+            self.fps = self.window_frames / (now - self.window_start)
+            self.window_start = now
+            self.window_frames = 0
+        return steps
+
+    def end_frame(self):
+        """Schedule the next frame for the next deadline"""
+        now = self.clock()
+        self.deadline += self.timestep
+        if now > self.deadline:
+            # The frame overran its budget; start pacing again from now
+            self.missed_deadlines += 1
+            self.deadline = now
+        delay_ms = math.ceil((self.deadline - now) * 1000)
+        self.after_id = self.root.after(delay_ms, self.callback)
@@ -0,0 +1,221 @@
+import tkinter as tk
+
+from entity_store import np
+from species import default_catalog
+
+# Outline thickness in pixels, same as the width=2 canvas items
+OUTLINE = 2
+
+# Keep each vectorized write below this many pixels to bound temporary memory
+MAX_PIXELS_PER_WRITE = 1_000_000
+
+
+def _oval_mask(dx, dy, rx, ry):
+    if rx <= 0 or ry <= 0:
+        return np.zeros(dx.shape, dtype=bool)
+    return ((dx + 0.5) / rx) ** 2 + ((dy + 0.5) / ry) ** 2 <= 1.0
+
+
+def _polygon_mask(px, py, xs, ys):
+    """Even-odd point in polygon test for every (px, py)"""
+    inside = np.zeros(px.shape, dtype=bool)
+    for i in range(len(xs)):
+        xa, ya, xb, yb = xs[i], ys[i], xs[i - 1], ys[i - 1]
+        if ya == yb:
+            continue
+        crosses = (ya > py) != (yb > py)
+        inside ^= crosses & (px < xa + (py - ya) * (xb - xa) / (yb - ya))
+    return inside
+
+
+def _eroded(mask, steps):
+    """`mask` shrunk by `steps` pixels"""
+    for _ in range(steps):
+        padded = np.pad(mask, 1)
+        mask = (padded[1:-1, 1:-1] & padded[:-2, 1:-1] & padded[2:, 1:-1] &
+                padded[1:-1, :-2] & padded[1:-1, 2:])
+    return mask
+
+
+def _stamp(species, size):
+    """Pixel offsets (dy, dx) of the fill and outline of a species' body"""
+    offsets = species.body_offsets(size)
+    xs, ys = offsets[0::2], offsets[1::2]
+    x0, x1, y0, y1 = min(xs), max(xs), min(ys), max(ys)
+    dy, dx = np.mgrid[y0:y1, x0:x1]
+    if species.kind == 'rectangle':
+        inside = np.ones(dx.shape, dtype=bool)
+        border = ((dx < x0 + OUTLINE) | (dx >= x1 - OUTLINE) |
+                  (dy < y0 + OUTLINE) | (dy >= y1 - OUTLINE))
+    elif species.kind == 'oval':
+        cx, cy, rx, ry = (x0 + x1) / 2, (y0 + y1) / 2, (x1 - x0) / 2, (y1 - y0) / 2
+        inside = _oval_mask(dx - cx, dy - cy, rx, ry)
+        border = inside & ~_oval_mask(dx - cx, dy - cy, rx - OUTLINE, ry - OUTLINE)
+    else:
+        inside = _polygon_mask(dx + 0.5, dy + 0.5, xs, ys)
+        border = inside & ~_eroded(inside, OUTLINE)
+    fill = inside & ~border
+    return (dy[fill], dx[fill]), (dy[border], dx[border])
+
+
+def _eye_stamp(species, size):
+    """Pixel offsets (dy, dx) of both eyes, relative to the animal center"""
+    boxes = species.eye_offsets(size)
+    if not boxes:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    eye_size = boxes[0][2] - boxes[0][0]
+    radius = eye_size / 2
+    dy, dx = np.mgrid[0:eye_size, 0:eye_size]
+    mask = _oval_mask(dx - radius, dy - radius, radius, radius)
+    ey, ex = dy[mask], dx[mask]
+    return (np.concatenate([ey + y0 for x0, y0, _, _ in boxes]),
+            np.concatenate([ex + x0 for x0, y0, _, _ in boxes]))
+
+
+class FramebufferRenderer:
+    """Rasterizes all animals into one pixel buffer shown as a single image.
+
+    Instead of three canvas items per animal, every body and eye is written
+    into a NumPy buffer of packed 0x00BBGGRR pixels with vectorized
+    fancy-index stores, one write per (layout, size) group and layer, and
+    the buffer is blitted to one PhotoImage.
+    The buffer is allocated once; new animals are drawn on top of it, and
+    it is only wiped and redrawn when an animal moved or was removed.
+    A layout is a species' body template and eye positions, see species.py.
+    Animals in different (layout, size) groups are not stacked in spawn order
+    where they overlap.
+    """
+
+    def __init__(self, canvas, commands, width, height, background='lightblue', catalog=None):
+        if np is None:
+            raise RuntimeError("the framebuffer renderer needs NumPy")
+        self.catalog = catalog if catalog is not None else default_catalog()
+        self.canvas = canvas
+        self.commands = commands
+        self.width = width
+        self.height = height
+        self.header = f"P6 {width} {height} 255 ".encode('ascii')
+        self.packed = np.empty(width * height, dtype=np.uint32)
+        # The whole PPM blit, header then RGB bytes; `pixels` views its tail and is
+        # filled from `packed` without reallocating
+        # (on little-endian machines the packed bytes read R, G, B, 0)
+        self.ppm = bytearray(len(self.header) + width * height * 3)
+        self.ppm[:len(self.header)] = self.header
+        self.pixels = np.frombuffer(self.ppm, dtype=np.uint8, offset=len(self.header)).reshape(height, width, 3)
+        self.channels = self.packed.view(np.uint8).reshape(height, width, 4)[:, :, :3]
+        self.rgb_cache = {}
+        self.background = self.rgb(background)
+        self.stamps = {}  # (layout, size) -> body and eye stamps
+        self.image = tk.PhotoImage(width=width, height=height)
+        self.image_item = None
+        self.items_raised = False  # The image item was put on top since the overlay was last raised
+        self.pool = None  # No per-animal canvas items to recycle
+        self.lod = None  # Every animal is a stamp, there is no cheaper level
+        self.drawn_count = 0
+        self.needs_redraw = True
+        self.pushed = 0
+        self.skipped = 0
+        self.reset()
+
+    def rgb(self, color):
+        """Packed 0x00BBGGRR pixel of a Tk color name, resolved once per name"""
+        if color not in self.rgb_cache:
+            r, g, b = self.canvas.winfo_rgb(color)
+            self.rgb_cache[color] = (r >> 8) | (g >> 8) << 8 | (b >> 8) << 16
+        return self.rgb_cache[color]
+
+    def create_visuals(self, animal_type, x, y, size, color):
+        """Animals have no canvas items of their own here"""
+        return None, ()
+
+    def create_visuals_many(self, animal_types, xs, ys, sizes, colors):
+        return [None] * len(xs), [()] * len(xs)
+
+    def delete_visuals(self, body_id, eyes):
+        # The removed animal is baked into the buffer, so repaint everything
+        self.needs_redraw = True
+
+    def clear_visuals(self):
+        self.needs_redraw = True
+
+    def reset(self):
+        """Put the image item back after the canvas was wiped"""
+        self.image_item = self.commands.create_image(0, 0, image=self.image, anchor='nw')
+        self.items_raised = True
+        self.needs_redraw = True
+
+    def sync(self, animals):
+        """Draw new or changed animals and blit the buffer if anything changed"""
+        count = len(animals)
+        if self.needs_redraw or count < self.drawn_count or animals.dirty_indices():
+            self.packed.fill(self.background)
+            self._draw(animals, 0, count)
+            self.pushed = count
+        elif count > self.drawn_count:
+            # Only appends since the last frame: draw the newcomers on top
+            self._draw(animals, self.drawn_count, count)
+            self.pushed = count - self.drawn_count
+        else:
+            self.pushed = 0
+        self.skipped = count - self.pushed
+        if self.needs_redraw or self.pushed:
+            animals.mark_all_drawn()
+            np.copyto(self.pixels, self.channels)
+            # Tkinter only hands bytes over as binary data, a bytearray would arrive as its repr
+            self.image.configure(data=bytes(self.ppm), format='PPM')
+        self.drawn_count = count
+        self.needs_redraw = False
+
+    def _draw(self, animals, start, stop):
+        if stop <= start:
+            return
+        xs = np.rint(animals.column('x')[start:stop]).astype(np.int64)
+        ys = np.rint(animals.column('y')[start:stop]).astype(np.int64)
+        sizes = animals.column('size')[start:stop].astype(np.int64)
+        # Look up per distinct species and color, then spread over the animals by code
+        types, colors = animals.animal_type, animals.color
+        species = [self.catalog[name] for name in types.values]
+        type_codes = np.frombuffer(types.codes, dtype=np.uint16)[start:stop]
+        color_codes = np.frombuffer(colors.codes, dtype=np.uint16)[start:stop]
+        layouts = np.array([s.layout for s in species], dtype=np.int64)[type_codes]
+        outlines = np.array([self.rgb(s.outline) for s in species], dtype=np.uint32)[type_codes]
+        fills = np.array([self.rgb(c) for c in colors.values], dtype=np.uint32)[color_codes]
+        black = np.uint32(self.rgb('black'))
+        by_layout = {s.layout: s for s in species}
+
+        # Draw each (layout, size) group with one vectorized write per layer
+        keys = layouts * 1024 + sizes
+        order = np.argsort(keys, kind='stable')
+        group_keys, group_starts = np.unique(keys[order], return_index=True)
+        group_ends = list(group_starts[1:]) + [len(order)]
+        for key, begin, end in zip(group_keys.tolist(), group_starts.tolist(), group_ends):
+            layout, size = divmod(key, 1024)
+            members = order[begin:end]
+            if (layout, size) not in self.stamps:
+                self.stamps[layout, size] = (_stamp(by_layout[layout], size),
+                                             _eye_stamp(by_layout[layout], size))
+            (fill, border), eyes = self.stamps[layout, size]
+            self._stamp(xs[members], ys[members], fill, fills[members])
+            self._stamp(xs[members], ys[members], border, outlines[members])
+            self._stamp(xs[members], ys[members], eyes, black)
+
+    def _stamp(self, xs, ys, offsets, colors):
+        dy, dx = offsets
+        if len(dx) == 0:
+            return
+        # Pixels only need clipping when the group's stamps reach past an edge
+        clip = (xs.min() + dx.min() < 0 or xs.max() + dx.max() >= self.width or
+                ys.min() + dy.min() < 0 or ys.max() + dy.max() >= self.height)
+        offsets = dy * self.width + dx
+        bases = ys * self.width + xs
+        step = max(1, MAX_PIXELS_PER_WRITE // len(dx))
+        for begin in range(0, len(xs), step):
+            color = colors if colors.ndim == 0 else colors[begin:begin + step, None]
+            index = bases[begin:begin + step, None] + offsets
+            if not clip:
+                self.packed[index] = color
+                continue
+            px = xs[begin:begin + step, None] + dx
+            py = ys[begin:begin + step, None] + dy
+            inside = (px >= 0) & (px < self.width) & (py >= 0) & (py < self.height)
+            self.packed[index[inside]] = np.broadcast_to(color, index.shape)[inside]
@@ -0,0 +1,157 @@
+"""Big letters and numbers rendered once into images instead of drawn as text.
+
+A Label showing 200pt text makes Tk shape and rasterize the glyph again
+on every change. A GlyphCache renders every symbol of a game once with
+Pillow and hands out PhotoImages, so a key press only swaps the label's
+image. The glyphs are scaled down to fit windows too small for the font,
+so the cache is keyed by the font and the resulting pixel size and is
+rendered again, lazily, when a resize (usually fullscreen) changes it.
+
+Without Pillow, or without a font file for the Tk font's family, `image`
+returns None and the games keep drawing text.
+"""
+import base64
+import io
+import tkinter as tk
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+# Font files tried for a Tk font family, looked up by Pillow in the system font folders
+FONT_FILES = {
+    'arial': {
+        'bold': ('arialbd.ttf', 'Arial Bold.ttf', 'Arial_Bold.ttf'),
+        'normal': ('arial.ttf', 'Arial.ttf'),
+    },
+}
+
+# Tried when no file of the family itself is found
+FALLBACK_FONT_FILES = {
+    'bold': ('LiberationSans-Bold.ttf', 'DejaVuSans-Bold.ttf'),
+    'normal': ('LiberationSans-Regular.ttf', 'DejaVuSans.ttf'),
+}
+
+
+class GlyphCache:
+    """One PhotoImage per symbol, for the current font and glyph size.
+
+    Glyphs are as tall as `font` draws them, but at most `fill` of the
+    window height. `warm` renders the symbols one per event-loop turn, so
+    startup and key presses are not held up; a symbol asked for before it
+    is warmed is rendered on the spot.
+    """
+
+    def __init__(self, root, font, symbols, fg='white', bg='black', fill=0.8):
+        self.root = root
+        self.font = font
+        self.symbols = symbols
+        self.fg = fg
+        self.bg = bg
+        self.fill = fill
+        self.window_height = None
+        self.key = None  # (font file, pixel size) the images were rendered with
+        self.images = {}
+        self.pil_font = None
+        self.font_path = None
+        self.after_id = None
+        self.hits = 0
+        self.misses = 0
+        self.renders = 0
+
+    def _font_files(self):
+        actual = self.font.actual()
+        weight = 'bold' if actual['weight'] == 'bold' else 'normal'
+        return FONT_FILES.get(actual['family'].lower(), {}).get(weight, ()) + FALLBACK_FONT_FILES[weight]
+
+    def pixel_size(self):
+        """Glyph size in pixels for the font and the window height"""
+        size = self.font.actual()['size']
+        # Tk sizes are points when positive and pixels when negative
+        pixels = -size if size < 0 else round(size * self.root.winfo_fpixels('1i') / 72)
+        if self.window_height:
+            pixels = min(pixels, int(self.window_height * self.fill))
+        return max(1, pixels)
+
+    def _current_key(self):
+        if Image is None:
+            return None
+        pixels = self.pixel_size()
+        if self.key is not None and self.key[1] == pixels:
+            return self.key
+        for path in ([self.font_path] if self.font_path else self._font_files()):
+            try:
+                self.pil_font = ImageFont.truetype(path, pixels)
+            except OSError:
+                continue
+            self.font_path = path
+            return (path, pixels)
+        return None
+
+    def resize(self, width, height):
+        """Note the new window size, returns True if the glyphs have to be rendered again"""
+        self.window_height = height
+        key = self._current_key()
+        if key == self.key:
+            return False
+        self.key = key
+        self.images.clear()
+        if key is not None:
+            self.warm()  # Render the rest for the new size in the background
+        return True
+
+    def _rgb(self, color):
+        return tuple(c >> 8 for c in self.root.winfo_rgb(color))
+
+    def _render(self, symbol):
+        ascent, descent = self.pil_font.getmetrics()
+        left, _, right, _ = self.pil_font.getbbox(symbol)
+        # Same height for every symbol so the label does not jump
+        picture = Image.new('RGB', (max(1, right - left), ascent + descent), self._rgb(self.bg))
+        ImageDraw.Draw(picture).text((-left, 0), symbol, font=self.pil_font, fill=self._rgb(self.fg))
+        png = io.BytesIO()
+        picture.save(png, 'PNG')
+        self.renders += 1
+        return tk.PhotoImage(master=self.root, data=base64.b64encode(png.getvalue()).decode('ascii'),
+                             format='png')
+
+    def image(self, symbol):
+        """PhotoImage of `symbol`, or None if glyphs can't be rendered"""
+        if self.key is None:
+            self.key = self._current_key()
+            if self.key is None:
+                return None
+        image = self.images.get(symbol)
+        if image is not None:
+            self.hits += 1
+            return image
+        self.misses += 1
+        image = self.images[symbol] = self._render(symbol)
+        return image
+
+    def warm(self):
+        """Render the missing symbols in the background, one per event-loop turn"""
+        self.cancel()
+        self.after_id = self.root.after_idle(self._warm_next)
+
+    def _warm_next(self):
+        self.after_id = None
+        if self.key is None:
+            self.key = self._current_key()
+            if self.key is None:
+                return
+        for symbol in self.symbols:
+            if symbol not in self.images:
+                self.images[symbol] = self._render(symbol)
+                self.after_id = self.root.after(1, self._warm_next)
+                return
+
+    def cancel(self):
+        """Stop warming, call before the window goes away"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def stats_text(self):
+        return f"glyphs: {len(self.images)} cached, {self.renders} rendered, {self.hits} hits, {self.misses} misses"
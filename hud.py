@@ -0,0 +1,61 @@
+import time
+
+# Tag carried by every HUD item, so the HUD can be raised or spared in one command
+HUD_TAG = 'hud'
+
+
+class HudText:
+    """One text item of the HUD and what it currently shows"""
+    __slots__ = ('item', 'interval', 'shown', 'updated_at')
+
+    def __init__(self, item, interval):
+        self.item = item
+        self.interval = interval
+        self.shown = None
+        self.updated_at = None
+
+
+class RetainedHud:
+    """Text overlay whose canvas items are created once and then only reconfigured.
+
+    `add` creates a text item per widget. `set` is meant to be called every
+    frame with what the widget should say; the item is only touched when
+    that differs from what is on screen, and at most `max_rate` times a
+    second for throttled widgets, so a fast-changing value still settles on
+    its latest state. Everything goes through `canvas`, usually a
+    CanvasCommandBuffer.
+    """
+
+    def __init__(self, canvas, clock=time.monotonic):
+        self.canvas = canvas
+        self.clock = clock
+        self.widgets = {}
+        self.updates = 0  # itemconfigure calls sent so far
+
+    def add(self, name, x, y, text='', max_rate=None, **options):
+        """Create the text item for widget `name`, optionally throttled to `max_rate` Hz"""
+        item = self.canvas.create_text(x, y, text=text, tags=HUD_TAG, **options)
+        widget = self.widgets[name] = HudText(item, 1 / max_rate if max_rate else 0)
+        widget.shown = (text, ())
+
+    def set_rate(self, name, max_rate):
+        """Throttle widget `name` to `max_rate` Hz, None for no limit"""
+        self.widgets[name].interval = 1 / max_rate if max_rate else 0
+
+    def set(self, name, text, **options):
+        """Show `text` (and optionally restyle) widget `name` if it changed"""
+        widget = self.widgets[name]
+        wanted = (text, tuple(sorted(options.items())))
+        if wanted == widget.shown:
+            return
+        now = self.clock()
+        if widget.updated_at is not None and now - widget.updated_at < widget.interval:
+            return
+        self.canvas.itemconfigure(widget.item, text=text, **options)
+        widget.shown = wanted
+        widget.updated_at = now
+        self.updates += 1
+
+    def raise_to_top(self):
+        """Put the HUD back above items created or raised after it"""
+        self.canvas.tag_raise(HUD_TAG)
@@ -0,0 +1,97 @@
+# Tag carried by every pooled item, so one command can hide them all
+POOL_TAG = 'pooled'
+
+# Coordinates a hidden item is parked at, per canvas item kind
+_PARKED_COORDS = {
+    'oval': (0, 0, 0, 0),
+    'rectangle': (0, 0, 0, 0),
+    'polygon': (0, 0, 0, 0, 0, 0),
+    'image': (0, 0),
+    'marker': (0, 0, 0, 0),
+}
+
+# Pool kinds that are drawn with a different canvas item type
+_ITEM_TYPE = {
+    'marker': 'rectangle',
+}
+
+
+class CanvasItemPool:
+    """Recycles hidden canvas items instead of deleting and recreating them.
+
+    `acquire` hands out a free item of the requested kind, moved, restyled,
+    shown and raised to the top, and only creates a new item when the free
+    list for that kind is empty. `release` hides an item and keeps it for
+    reuse, unless `ceiling` free items of that kind are already waiting, in
+    which case it is deleted. All calls go through `canvas`, usually a
+    CanvasCommandBuffer, so the work is batched with the rest of the frame.
+    """
+
+    def __init__(self, canvas, ceiling=10000):
+        self.canvas = canvas
+        self.ceiling = ceiling
+        self.free = {kind: [] for kind in _PARKED_COORDS}
+        self.in_use = {}  # item -> kind
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+
+    def __len__(self):
+        """Number of hidden items waiting for reuse"""
+        return sum(len(items) for items in self.free.values())
+
+    def _create(self, kind, coords, options):
+        create = getattr(self.canvas, 'create_' + _ITEM_TYPE.get(kind, kind))
+        return create(*coords, tags=POOL_TAG, **options)
+
+    def prefill(self, kind, count, **options):
+        """Create `count` hidden items of `kind` ahead of time"""
+        free = self.free[kind]
+        for _ in range(min(count, self.ceiling - len(free))):
+            free.append(self._create(kind, _PARKED_COORDS[kind], dict(options, state='hidden')))
+
+    def acquire(self, kind, coords, **options):
+        """Return a visible item of `kind` at `coords` with `options` applied"""
+        free = self.free[kind]
+        if free:
+            item = free.pop()
+            self.hits += 1
+            self.canvas.coords(item, *coords)
+            self.canvas.itemconfigure(item, state='normal', **options)
+            self.canvas.tag_raise(item)
+        else:
+            item = self._create(kind, coords, options)
+            self.misses += 1
+        self.in_use[item] = kind
+        return item
+
+    def release(self, *items):
+        """Hide `items` and keep them for reuse, up to the ceiling"""
+        for item in items:
+            kind = self.in_use.pop(item)
+            free = self.free[kind]
+            if len(free) < self.ceiling:
+                self.canvas.itemconfigure(item, state='hidden')
+                free.append(item)
+            else:
+                self.canvas.delete(item)
+                self.discarded += 1
+
+    def release_all(self):
+        """Hide every item in use with a single canvas command"""
+        overflow = []
+        for item, kind in self.in_use.items():
+            free = self.free[kind]
+            if len(free) < self.ceiling:
+                free.append(item)
+            else:
+                overflow.append(item)
+        self.in_use.clear()
+        self.canvas.itemconfigure(POOL_TAG, state='hidden')
+        if overflow:
+            self.canvas.delete(*overflow)
+            self.discarded += len(overflow)
+
+    def stats_text(self):
+        return (f"pool: {self.hits} hits, {self.misses} misses, {self.discarded} discarded, "
+                f"{len(self)} free")
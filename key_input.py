@@ -0,0 +1,71 @@
+import time
+
+
+class KeyCoalescer:
+    """Folds a burst of key presses into one net step per display frame.
+
+    Key handlers call `push(delta)` instead of changing the screen
+    themselves. The deltas are summed and handed to `apply` at most once
+    per frame, so twenty queued presses become a single "advance by 20"
+    and one redraw. The first press after a quiet spell is applied on the
+    next idle turn, so a single press is not delayed.
+
+    With `max_rate` set, presses closer together than 1 / `max_rate`
+    seconds are dropped, which tames autorepeat and keyboard mashing.
+    `accepted`, `dropped` and `applied` (calls to `apply`) count what
+    happened to the presses.
+    """
+
+    def __init__(self, root, apply, target_fps=60, max_rate=None, clock=time.monotonic):
+        self.root = root
+        self.apply = apply
+        self.clock = clock
+        self.frame = 1.0 / target_fps
+        self.set_max_rate(max_rate)
+        self.net = 0
+        self.after_id = None
+        self.last_press = None
+        self.last_apply = None
+        self.accepted = 0
+        self.dropped = 0
+        self.applied = 0
+
+    def set_max_rate(self, max_rate):
+        """Accept at most `max_rate` presses a second, None for no limit"""
+        self.interval = 1.0 / max_rate if max_rate else 0.0
+
+    def push(self, delta=1):
+        """Record a press worth `delta` steps, returns False if it was dropped"""
+        now = self.clock()
+        if self.last_press is not None and now - self.last_press < self.interval:
+            self.dropped += 1
+            return False
+        self.last_press = now
+        self.accepted += 1
+        self.net += delta
+        if self.after_id is None:
+            wait = 0.0 if self.last_apply is None else self.last_apply + self.frame - now
+            if wait > 0:
+                self.after_id = self.root.after(int(wait * 1000) + 1, self.flush)
+            else:
+                self.after_id = self.root.after_idle(self.flush)
+        return True
+
+    def flush(self):
+        """Hand the net step of the presses so far to `apply`"""
+        self.after_id = None
+        net, self.net = self.net, 0
+        self.last_apply = self.clock()
+        if net:
+            self.apply(net)
+            self.applied += 1
+
+    def cancel(self):
+        """Forget pending presses, call before the window goes away"""
+        if self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+        self.net = 0
+
+    def stats_text(self):
+        return f"keys: {self.accepted} accepted, {self.dropped} dropped, {self.applied} screen updates"
@@ -0,0 +1,177 @@
+"""All the games in one window, switched from a menu without restarting.
+
+The Tk root is made once and kept warm. A game's module is imported the
+first time it is picked, and the game is built on the shared root. Q
+(or ESC, outside fullscreen) closes it: its close() takes its widgets,
+key bindings and timers off the window and the menu comes back.
+
+    python launcher.py              # the menu
+    python launcher.py --benchmark  # cold start and switch times per game
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+# Menu key -> (name, module, game class)
+GAMES = {
+    '1': ("Letters", 'letters', 'LetterCycleGame'),
+    '2': ("Numbers", 'number_game', 'NumberCycleGame'),
+    '3': ("Colors", 'colors', 'ColorCycleGame'),
+    '4': ("Animal spawner", 'peppa_pig_spawner_tkinter', 'PeppaPigSpawner'),
+}
+
+
+class Launcher:
+    """Menu on a warm Tk root that builds each game on first use"""
+
+    def __init__(self, root=None):
+        self.root = root if root is not None else tk.Tk()
+        self.classes = {}  # Menu key -> game class, imported on first use
+        self.game = None
+        self.menu = None
+        self.bindings = []
+        self.root.protocol("WM_DELETE_WINDOW", self.quit)
+        self.show_menu()
+
+    def game_class(self, key):
+        """The game class for menu `key`, importing its module the first time"""
+        if key not in self.classes:
+            _, module, name = GAMES[key]
+            self.classes[key] = getattr(importlib.import_module(module), name)
+        return self.classes[key]
+
+    def show_menu(self):
+        """Put the menu on the window"""
+        self.game = None
+        self.root.title("Games")
+        self.root.geometry("800x600")
+        self.root.configure(bg="black")
+        try:
+            self.root.attributes("-fullscreen", False)  # Games may have left it fullscreen
+        except tk.TclError:
+            pass
+        lines = [f"{key}  {name}" for key, (name, _, _) in GAMES.items()]
+        self.menu = tk.Label(
+            self.root,
+            text="\n".join(lines + ["", "Q = Quit"]),
+            font=("Arial", 28, "bold"),
+            fg="white",
+            bg="black",
+            justify="left"
+        )
+        self.menu.pack(expand=True)
+        self.bindings = [(sequence, self.root.bind(sequence, callback)) for sequence, callback in (
+            ("<KeyPress>", self.on_key_press),
+        )]
+        self.root.focus_set()
+
+    def hide_menu(self):
+        for sequence, funcid in self.bindings:
+            self.root.unbind(sequence, funcid)
+        self.bindings = []
+        self.menu.destroy()
+        self.menu = None
+
+    def on_key_press(self, event):
+        if event.char in GAMES:
+            self.launch(event.char)
+        elif event.keysym.lower() in ('escape', 'q'):
+            self.quit()
+
+    def launch(self, key):
+        """Close the menu and start the game for menu `key`"""
+        self.hide_menu()
+        game = self.game_class(key)(root=self.root, on_quit=self.show_menu)
+        if hasattr(game, 'start'):
+            game.start()
+        self.game = game
+        return game
+
+    def quit(self):
+        """Close the running game, if any, and the window"""
+        if self.game is not None:
+            self.game.close()
+            self.game = None
+        self.root.destroy()
+
+    def run(self):
+        self.root.mainloop()
+
+
+def pending_afters(root):
+    """Number of `after` callbacks still scheduled on the Tcl side"""
+    return len(root.tk.splitlist(root.tk.call('after', 'info')))
+
+
+def process_start(module, name):
+    """Seconds for a fresh Python process to show one frame of a game"""
+    script = (f"import tkinter as tk; root = tk.Tk(); from {module} import {name}; "
+              f"game = {name}(root=root); getattr(game, 'start', lambda: None)(); root.update()")
+    started = time.perf_counter()
+    # Run next to the games, wherever the launcher was started from
+    subprocess.run([sys.executable, '-c', script], check=True, capture_output=True,
+                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    return time.perf_counter() - started
+
+
+def benchmark(switches=10, output='launcher_results.json'):
+    """Time cold starts, switches and teardown of every game on one warm root"""
+    launcher = Launcher()
+    root = launcher.root
+    root.update()
+    baseline_afters = pending_afters(root)
+    baseline_widgets = len(root.winfo_children())
+    results = {}
+    for key, (name, module, game_class) in GAMES.items():
+        # Cold: import the module and build the game for the first time
+        started = time.perf_counter()
+        game = launcher.launch(key)
+        root.update()
+        cold = time.perf_counter() - started
+
+        # Warm: back to the menu and into the game again
+        switch_times = []
+        for _ in range(switches):
+            started = time.perf_counter()
+            game.close()
+            launcher.show_menu()
+            launcher.launch(key)
+            root.update()
+            switch_times.append(time.perf_counter() - started)
+            game = launcher.game
+        game.close()
+        launcher.show_menu()
+        root.update()
+        results[name] = {
+            'process_start_ms': round(process_start(module, game_class) * 1000, 1),
+            'cold_start_ms': round(cold * 1000, 1),
+            'switch_ms': round(sorted(switch_times)[switches // 2] * 1000, 1),  # Median
+            'leaked_afters': pending_afters(root) - baseline_afters,
+            'leaked_widgets': len(root.winfo_children()) - baseline_widgets,
+        }
+        metrics = results[name]
+        print(f"{name:15} process {metrics['process_start_ms']:8.1f} ms  cold {metrics['cold_start_ms']:8.1f} ms  "
+              f"switch {metrics['switch_ms']:7.1f} ms  leaked afters {metrics['leaked_afters']} "
+              f"widgets {metrics['leaked_widgets']}")
+    launcher.quit()
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {output}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pick a game from one window")
+    parser.add_argument('--benchmark', action='store_true', help="time starting and switching every game")
+    parser.add_argument('--switches', type=int, default=10, help="switches per game to take the median of")
+    parser.add_argument('--output', default='launcher_results.json')
+    args = parser.parse_args()
+    if args.benchmark:
+        benchmark(args.switches, args.output)
+    else:
+        Launcher().run()
@@ -1,9 +1,13 @@
 import tkinter as tk
 from tkinter import font
 
+from glyph_cache import GlyphCache
+from key_input import KeyCoalescer
+
 class LetterCycleGame:
-    def __init__(self, root):
+    def __init__(self, root, max_key_rate=None, on_quit=None):
         self.root = root
+        self.on_quit = on_quit  # Called instead of closing the window, see launcher.py
         self.letters = ['A', 'B', 'C', 'D', 'E', 'F', 'S']
         self.current_index = 0
         self.fullscreen = False
@@ -26,6 +30,11 @@ class LetterCycleGame:
         )
         self.letter_label.pack(expand=True)
         
+        # The letters are shown as pre-rendered images when Pillow can draw them
+        self.glyphs = GlyphCache(self.root, self.large_font, self.letters, fg="white", bg="black")
+        self.show_letter()
+        self.glyphs.warm()
+        
         # Instructions label
         self.instructions = tk.Label(
             self.root,
@@ -36,14 +45,35 @@ class LetterCycleGame:
         )
         self.instructions.pack(side="bottom", pady=10)
         
-        # Bind key events
-        self.root.bind("<KeyPress>", self.on_key_press)
+        # Key presses are folded into one letter change per frame
+        self.keys = KeyCoalescer(self.root, self.cycle_letter, max_rate=max_key_rate)
+        self.key_stats = max_key_rate is not None  # Report dropped presses on close
+        
+        # Bind key events, keeping the ids so close() can take them off the shared window
+        self.bindings = [(sequence, self.root.bind(sequence, callback)) for sequence, callback in (
+            ("<KeyPress>", self.on_key_press),
+            ("<Configure>", self.on_window_resize),
+        )]
         self.root.focus_set()  # Ensure the window can receive key events
         
-    def cycle_letter(self):
-        """Move to the next letter in the sequence"""
-        self.current_index = (self.current_index + 1) % len(self.letters)
-        self.letter_label.config(text=self.letters[self.current_index])
+    def show_letter(self):
+        """Put the current letter on the label, as an image if there is one"""
+        symbol = self.letters[self.current_index]
+        image = self.glyphs.image(symbol)
+        if image is not None:
+            self.letter_label.config(image=image)
+        else:
+            self.letter_label.config(text=symbol)
+    
+    def on_window_resize(self, event):
+        """Render the glyphs again if the window size changes their size"""
+        if event.widget is self.root and self.glyphs.resize(event.width, event.height):
+            self.show_letter()
+        
+    def cycle_letter(self, steps=1):
+        """Move `steps` letters on in the sequence"""
+        self.current_index = (self.current_index + steps) % len(self.letters)
+        self.show_letter()
         
     def toggle_fullscreen(self):
         """Toggle fullscreen mode"""
@@ -75,9 +105,24 @@ class LetterCycleGame:
         else:
             self.quit_game()
     
+    def close(self):
+        """Take the game off the window, leaving no widgets, bindings or timers behind"""
+        self.keys.cancel()
+        self.glyphs.cancel()
+        if self.key_stats:
+            print(self.keys.stats_text())  # Debug output
+        for sequence, funcid in self.bindings:
+            self.root.unbind(sequence, funcid)
+        self.letter_label.destroy()
+        self.instructions.destroy()
+    
     def quit_game(self):
         """Close the game"""
-        self.root.destroy()
+        self.close()
+        if self.on_quit is not None:
+            self.on_quit()
+        else:
+            self.root.destroy()
     
     def on_key_press(self, event):
         """Handle key press events"""
@@ -89,7 +134,7 @@ class LetterCycleGame:
             self.exit_fullscreen_or_quit()
         else:
             # Any other key cycles through the letters
-            self.cycle_letter()
+            self.keys.push(1)
 
 def main():
     root = tk.Tk()
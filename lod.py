@@ -0,0 +1,44 @@
+# Ways an animal can be drawn, most detailed first
+LOD_FULL = 'full'  # Body plus two eyes (or the picture)
+LOD_NO_EYES = 'no_eyes'  # Body only, the eyes would be a pixel or two anyway
+LOD_MARKER = 'marker'  # A single tiny square in the animal's color
+LOD_LEVELS = (LOD_FULL, LOD_NO_EYES, LOD_MARKER)
+
+
+class LodPolicy:
+    """Decides how much detail an animal gets from its size and the crowd size.
+
+    Animals smaller than `eye_min_size` pixels are drawn without eyes. Once
+    there are `marker_count` animals or more, every animal becomes a
+    `marker_size` pixel marker, and stays one until the crowd shrinks below
+    `marker_count * (1 - hysteresis)`, so hovering around the threshold does
+    not flip the whole screen back and forth. Set `marker_count` to None to
+    never use markers.
+    """
+
+    def __init__(self, eye_min_size=24, marker_count=20000, hysteresis=0.2, marker_size=1):
+        self.eye_min_size = eye_min_size
+        self.marker_count = marker_count
+        self.hysteresis = hysteresis
+        self.marker_size = marker_size
+        self.crowded = False
+
+    def update(self, count):
+        """Switch marker mode on or off for `count` animals, returns True if it changed"""
+        if self.marker_count is None:
+            crowded = False
+        elif self.crowded:
+            crowded = count >= self.marker_count * (1 - self.hysteresis)
+        else:
+            crowded = count >= self.marker_count
+        changed = crowded != self.crowded
+        self.crowded = crowded
+        return changed
+
+    def level(self, size):
+        """Level of detail for an animal `size` pixels across"""
+        if self.crowded:
+            return LOD_MARKER
+        if size < self.eye_min_size:
+            return LOD_NO_EYES
+        return LOD_FULL
@@ -0,0 +1,220 @@
+import tkinter as tk
+from tkinter import font
+
+from glyph_cache import GlyphCache
+from key_input import KeyCoalescer
+
+# Bar geometry in pixels
+BAR_WIDTH = 40
+BAR_HEIGHT = 60
+BAR_SPACING = 10
+BAR_TOP = 20
+
+# Tag carried by every bar, so they can be moved in one command
+BAR_TAG = 'bar'
+
+class NumberCycleGame:
+    def __init__(self, root, max_key_rate=None, on_quit=None):
+        self.root = root
+        self.on_quit = on_quit  # Called instead of closing the window, see launcher.py
+        self.numbers = [str(n) for n in range(1, 10)]
+        self.current_index = 0
+        self.fullscreen = False
+        
+        # Configure the window
+        self.root.title("Number Cycle Game")
+        self.root.geometry("800x600")
+        self.root.configure(bg="black")
+        
+        # Create a large font for the numbers
+        self.large_font = font.Font(family="Arial", size=200, weight="bold")
+        
+        # Create the label to display the number
+        self.number_label = tk.Label(
+            self.root,
+            text=self.numbers[self.current_index],
+            font=self.large_font,
+            fg="white",
+            bg="black"
+        )
+        self.number_label.pack(expand=True)
+        
+        # The numbers are shown as pre-rendered images when Pillow can draw them
+        self.glyphs = GlyphCache(self.root, self.large_font, self.numbers, fg="white", bg="black")
+        self.show_number()
+        self.glyphs.warm()
+        
+        # Create canvas for drawing bars
+        self.canvas = tk.Canvas(
+            self.root,
+            height=100,
+            bg="black",
+            highlightthickness=0
+        )
+        self.canvas.pack(fill="x", padx=20, pady=10)
+        
+        # One bar item per number, created once and then only shown, hidden and moved
+        self.bars = [
+            self.canvas.create_rectangle(
+                0, 0, 0, 0,
+                fill="lightblue",
+                outline="white",
+                width=2,
+                state="hidden",
+                tags=BAR_TAG
+            )
+            for _ in self.numbers
+        ]
+        self.shown_bars = 0
+        self.canvas_width = 0  # Known from the first <Configure>
+        self.bars_x = 0  # Left edge of the first bar
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+        
+        # Draw initial bars
+        self.draw_bars()
+        
+        # Instructions label
+        self.instructions = tk.Label(
+            self.root,
+            text="Press any key to cycle through numbers (1-9) | F = Toggle Fullscreen | ESC/Q = Quit",
+            font=("Arial", 12),
+            fg="gray",
+            bg="black"
+        )
+        self.instructions.pack(side="bottom", pady=10)
+        
+        # Key presses are folded into one number change per frame
+        self.keys = KeyCoalescer(self.root, self.cycle_number, max_rate=max_key_rate)
+        self.key_stats = max_key_rate is not None  # Report dropped presses on close
+        
+        # Bind key events, keeping the ids so close() can take them off the shared window
+        self.bindings = [(sequence, self.root.bind(sequence, callback)) for sequence, callback in (
+            ("<KeyPress>", self.on_key_press),
+            ("<Configure>", self.on_window_resize),
+        )]
+        self.root.focus_set()  # Ensure the window can receive key events
+        
+    def show_number(self):
+        """Put the current number on the label, as an image if there is one"""
+        symbol = self.numbers[self.current_index]
+        image = self.glyphs.image(symbol)
+        if image is not None:
+            self.number_label.config(image=image)
+        else:
+            self.number_label.config(text=symbol)
+    
+    def on_window_resize(self, event):
+        """Render the glyphs again if the window size changes their size"""
+        if event.widget is self.root and self.glyphs.resize(event.width, event.height):
+            self.show_number()
+        
+    def cycle_number(self, steps=1):
+        """Move `steps` numbers on in the sequence"""
+        self.current_index = (self.current_index + steps) % len(self.numbers)
+        self.show_number()
+        self.draw_bars()  # Update bars when number changes
+        
+    def bars_left(self, count):
+        """Left edge of the first bar when `count` bars are centered"""
+        total_width = (BAR_WIDTH * count) + (BAR_SPACING * (count - 1))
+        return (self.canvas_width - total_width) // 2
+    
+    def on_canvas_resize(self, event):
+        """Lay the bars out again for the new canvas width"""
+        if event.width == self.canvas_width:
+            return
+        self.canvas_width = event.width
+        self.bars_x = self.bars_left(self.shown_bars)
+        for i, item in enumerate(self.bars):
+            x1 = self.bars_x + (i * (BAR_WIDTH + BAR_SPACING))
+            self.canvas.coords(item, x1, BAR_TOP, x1 + BAR_WIDTH, BAR_TOP + BAR_HEIGHT)
+    
+    def draw_bars(self):
+        """Show bars equal to the current number"""
+        current_number = int(self.numbers[self.current_index])
+        
+        # Only the bars between the old and the new number change state
+        for item in self.bars[current_number:self.shown_bars]:
+            self.canvas.itemconfigure(item, state="hidden")
+        for item in self.bars[self.shown_bars:current_number]:
+            self.canvas.itemconfigure(item, state="normal")
+        self.shown_bars = current_number
+        
+        # Keep the row centered; before the first <Configure> there is nothing to center in
+        if self.canvas_width:
+            bars_x = self.bars_left(current_number)
+            self.canvas.move(BAR_TAG, bars_x - self.bars_x, 0)
+            self.bars_x = bars_x
+        
+    def toggle_fullscreen(self):
+        """Toggle fullscreen mode"""
+        self.fullscreen = not self.fullscreen
+        try:
+            self.root.attributes("-fullscreen", self.fullscreen)
+        except Exception:
+            # Fallback for platforms where fullscreen attribute is not supported
+            if self.fullscreen:
+                self.root.state('zoomed')
+            else:
+                self.root.state('normal')
+                
+        # Hide/show instructions and canvas in fullscreen
+        if self.fullscreen:
+            self.instructions.pack_forget()
+            self.canvas.pack_forget()
+        else:
+            self.instructions.pack(side="bottom", pady=10)
+            self.canvas.pack(fill="x", padx=20, pady=10)
+    
+    def exit_fullscreen_or_quit(self):
+        """Exit fullscreen if in fullscreen mode, otherwise quit the game"""
+        if self.fullscreen:
+            self.fullscreen = False
+            try:
+                self.root.attributes("-fullscreen", False)
+            except Exception:
+                self.root.state('normal')
+            self.instructions.pack(side="bottom", pady=10)
+            self.canvas.pack(fill="x", padx=20, pady=10)
+        else:
+            self.quit_game()
+    
+    def close(self):
+        """Take the game off the window, leaving no widgets, bindings or timers behind"""
+        self.keys.cancel()
+        self.glyphs.cancel()
+        if self.key_stats:
+            print(self.keys.stats_text())  # Debug output
+        for sequence, funcid in self.bindings:
+            self.root.unbind(sequence, funcid)
+        self.number_label.destroy()
+        self.canvas.destroy()  # Takes the bar items with it
+        self.instructions.destroy()
+    
+    def quit_game(self):
+        """Close the game"""
+        self.close()
+        if self.on_quit is not None:
+            self.on_quit()
+        else:
+            self.root.destroy()
+    
+    def on_key_press(self, event):
+        """Handle key press events"""
+        key = event.keysym.lower()
+        
+        if key == 'f':
+            self.toggle_fullscreen()
+        elif key in ['escape', 'q']:
+            self.exit_fullscreen_or_quit()
+        else:
+            # Any other key cycles through the numbers
+            self.keys.push(1)
+
+def main():
+    root = tk.Tk()
+    game = NumberCycleGame(root)
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,30 @@
 import tkinter as tk
-from tkinter import PhotoImage
-import random
-import time
-import math
+import argparse
+
+from spawner_core import SpawnerSimulation, SpawnSchedule
+from tcl_batch import CanvasCommandBuffer
+from canvas_renderer import CanvasRenderer
+from framebuffer_renderer import FramebufferRenderer
+from frame_scheduler import FrameScheduler
+from frame_profiler import FrameProfiler
+from hud import RetainedHud, HUD_TAG
+from lod import LodPolicy
+from entity_budget import EntityBudget, EVICTION_POLICIES
+from species import SpeciesCatalog, default_catalog
+from sprite_cache import SpriteCache
+from physics_worker import PhysicsWorker, PHYSICS_MODES
+from quality import QualityController, QUALITY_LEVELS
+from snapshot import save_snapshot, load_snapshot
 
 class PeppaPigSpawner:
-    def __init__(self):
-        self.root = tk.Tk()
+    def __init__(self, backend='canvas', target_fps=60, profile_log=None, schedule=None,
+                 pool_ceiling=10000, pool_prefill=100, lod=None, budget=None, catalog=None, physics='main',
+                 adaptive_quality=False, max_quality_level=None, quality_log=None,
+                 snapshot_path='spawner.snapshot', restore=False, autosave=False, root=None, on_quit=None):
+        # A window of its own, or the launcher's (see launcher.py)
+        self.owns_root = root is None
+        self.root = root if root is not None else tk.Tk()
+        self.on_quit = on_quit
         self.root.title("Peppa Pig Spawner - Hold UP to spawn more!")
         
         # Make fullscreen
@@ -21,215 +39,258 @@ class PeppaPigSpawner:
         self.canvas = tk.Canvas(self.root, width=self.screen_width, height=self.screen_height, bg='lightblue')
         self.canvas.pack()
         
-        # Add escape key to exit fullscreen
-        self.root.bind('<Escape>', self.exit_fullscreen)
+        # Canvas mutations are queued here and sent to Tcl once per frame
+        self.commands = CanvasCommandBuffer(self.canvas)
         
-        # Try to load Peppa Pig image (tkinter supports GIF, PPM/PGM, some PNG)
-        self.peppa_image = None
-        try:
-            # First try to load if it's a supported format
-            self.peppa_image = PhotoImage(file="peppa.webp")
-            # Scale down the image if it's too large
-            if self.peppa_image.width() > 60:
-                scale_factor = max(1, self.peppa_image.width() // 60)
-                self.peppa_image = self.peppa_image.subsample(scale_factor)
-        except (tk.TclError, FileNotFoundError):
-            # If image can't be loaded, we'll use simple shapes instead
-            self.peppa_image = None
-            print("Could not load Peppa_Pig.webp (tkinter has limited image format support).")
-            print("Using colorful shapes instead of images!")
+        # What each animal looks like and how often it spawns (see species.py)
+        self.catalog = catalog if catalog is not None else default_catalog()
+        
+        # The Peppa Pig sprite is loaded when the first animals are made (see load_sprites)
+        self.sprites = None
+        self.pool_prefill = pool_prefill
+        
+        # Pick the render backend: one canvas item per body/eye, or one shared pixel buffer
+        self.renderer = None
+        if backend == 'framebuffer':
+            try:
+                self.renderer = FramebufferRenderer(self.canvas, self.commands,
+                                                    self.screen_width, self.screen_height,
+                                                    catalog=self.catalog)
+            except RuntimeError as error:
+                print(f"Could not start the framebuffer renderer ({error}).")
+                print("Using canvas items instead!")
+        if self.renderer is None:
+            # Pushes moved animals to the canvas, skipping the ones that stayed put
+            self.renderer = CanvasRenderer(self.commands, self.sprites,
+                                           pool_ceiling=pool_ceiling, prefill=pool_prefill, lod=lod,
+                                           catalog=self.catalog)
+        self.sprites_loaded = not isinstance(self.renderer, CanvasRenderer)  # Pixels only, no sprites
+        
+        # Game state: animals, line layout, spawning and physics (see spawner_core.py)
+        self.sim = SpawnerSimulation(self.screen_width, self.screen_height, schedule=schedule,
+                                     catalog=self.catalog)
+        self.sim.create_visuals_many = self.renderer.create_visuals_many
+        self.sim.delete_visuals = self.renderer.delete_visuals
+        self.sim.clear_visuals = self.renderer.clear_visuals
+        self.sim.enable_grid()  # For clicking animals and collisions
+        self.sim.budget = budget  # Caps the crowd on long-running screens, None for no cap
+        self.animals = self.sim.animals  # Column store, see entity_store.py
+        
+        # Fixed-timestep simulation, frames paced to the target rate
+        self.scheduler = FrameScheduler(self.root, self.game_loop, target_fps=target_fps)
         
-        # Game variables
-        self.animals = []  # Changed from peppa_pigs to animals
-        self.up_pressed = False
-        self.up_press_time = 0
-        self.last_time = time.time()
+        # Optionally step the physics in a worker, off the Tk thread (see physics_worker.py)
+        if physics != 'main':
+            try:
+                self.sim.physics = PhysicsWorker(self.sim, physics, timestep=self.scheduler.timestep)
+            except RuntimeError as error:
+                print(f"Could not start the physics worker ({error}).")
+                print("Running physics in the game loop instead!")
         
-        # Line spawning variables
-        self.current_x = 100  # Starting x position
-        self.current_y = 200  # Starting y position
-        self.line_direction = 1  # 1 for right, -1 for left
-        self.animal_spacing = 60  # Space between animals
-        self.line_height_increment = 80  # How much to move down for new line
+        # Per-phase frame timings, shown with F3 and/or logged to profile_log
+        self.profiler = FrameProfiler(log_path=profile_log)
+        self.show_profiler = False
+        self.profiler_drawn_at = 0.0
         
-        # Bind keyboard events
-        self.root.bind('<KeyPress-Up>', self.on_up_press)
-        self.root.bind('<KeyRelease-Up>', self.on_up_release)
-        self.root.bind('<KeyPress-Down>', self.on_down_press)
-        self.root.bind('<KeyPress>', self.on_key_press)  # For focus
+        # Bind keyboard events, keeping the ids so close() can take them off a shared window
+        bindings = [
+            ('<Escape>', self.exit_fullscreen),
+            ('<Configure>', self.on_resize),
+            ('<KeyPress-Up>', self.on_up_press),
+            ('<KeyRelease-Up>', self.on_up_release),
+            ('<KeyPress-Down>', self.on_down_press),
+            ('<F3>', self.toggle_profiler),
+            ('<KeyPress-c>', self.toggle_collisions),
+            ('<F5>', self.save_scene),
+            ('<F9>', self.restore_scene),
+            ('<F8>', self.undo_reset),
+            ('<KeyPress>', self.on_key_press),  # For focus
+        ]
+        if on_quit is not None:
+            bindings.append(('<KeyPress-q>', self.quit_game))
+        self.bindings = [(sequence, self.root.bind(sequence, callback)) for sequence, callback in bindings]
+        self.canvas.bind('<Button-1>', self.on_click)
         self.root.focus_set()  # Make sure window can receive key events
         
-        # Instructions
+        # Instructions, stats line and bottom banner: created once, updated in place
         center_x = self.screen_width // 2
-        self.canvas.create_text(center_x, 30, text="Hold UP arrow to spawn Animals!", 
-                               font=("Arial", 16, "bold"), fill="white")
-        self.canvas.create_text(center_x, 55, text="Press DOWN to reset screen! Press ESC to exit fullscreen!", 
-                               font=("Arial", 12), fill="white")
+        self.hud = RetainedHud(self.commands)
+        self.hud.add('title', center_x, 30, text="Hold UP arrow to spawn Animals!", 
+                     font=("Arial", 16, "bold"), fill="white")
+        self.hud.add('help', center_x, 55, text="Press DOWN to reset screen! Press ESC to exit fullscreen!", 
+                     font=("Arial", 12), fill="white")
+        self.hud.add('stats', center_x, 80, max_rate=10, font=("Arial", 14), fill="white")
+        self.hud.add('banner', center_x, self.screen_height - 50)
+        
+        # Trade detail for frame rate when frames run long (see quality.py)
+        self.quality = None
+        if adaptive_quality:
+            knobs = {
+                'hud_rate': lambda rate: self.hud.set_rate('stats', rate),
+                'spawn_scale': lambda scale: setattr(self.sim, 'spawn_scale', scale),
+            }
+            if self.renderer.lod is not None:
+                self.eye_min_size = self.renderer.lod.eye_min_size  # Never show more eyes than asked for
+                knobs['sync_limit'] = lambda limit: setattr(self.renderer, 'sync_limit', limit)
+                knobs['eye_min_size'] = self.set_eye_min_size
+            self.quality = QualityController(knobs, target_fps=target_fps, max_level=max_quality_level,
+                                             log_path=quality_log)
         
-        # Start game loop
-        self.game_loop()
+        # The scene is saved with F5 and comes back with F9 (see snapshot.py). With `autosave`, DOWN
+        # also saves the animals it clears to a file of their own, which F8 brings back.
+        self.snapshot_path = snapshot_path
+        self.autosave_path = snapshot_path + '.autosave' if autosave else None
+        self.restore_on_start = restore
+    
+    def start(self):
+        """Start the game loop, restoring the saved animals first if asked to"""
+        if self.restore_on_start:
+            self.restore_scene()
+        self.scheduler.start()
+    
+    def load_sprites(self):
+        """Load the Peppa Pig sprite, converted once and cached on disk (see sprite_cache.py)"""
+        if self.sprites_loaded:
+            return
+        self.sprites_loaded = True
+        sprites = SpriteCache(self.root, self.catalog)
+        if not sprites.available():
+            # If image can't be loaded, we'll use simple shapes instead
+            print("Could not load peppa.webp (decoding WebP needs Pillow, or use a PNG/GIF sprite).")
+            print("Using colorful shapes instead of images!")
+            return
+        self.sprites = self.renderer.sprites = sprites
+        self.renderer.prefill(self.pool_prefill)
     
     def exit_fullscreen(self, event):
         """Exit fullscreen mode when Escape is pressed"""
         self.root.attributes('-fullscreen', False)
         self.root.geometry("800x600")
     
+    def on_resize(self, event):
+        """Tell off-screen eviction how much of the canvas is visible"""
+        if event.widget is self.root and self.sim.budget is not None:
+            if hasattr(self.sim.budget.policy, 'view'):
+                self.sim.budget.policy.view = (event.width, event.height)
+    
+    def set_eye_min_size(self, size):
+        """Quality knob: animals smaller than `size` are drawn without eyes, None for as configured"""
+        size = self.eye_min_size if size is None else max(self.eye_min_size, size)
+        if size != self.renderer.lod.eye_min_size:
+            self.renderer.lod.eye_min_size = size
+            self.renderer.relevel_pending = True  # Redraw everyone at the new level
+    
     def on_key_press(self, event):
         # This helps maintain focus for key events
         pass
     
     def on_up_press(self, event):
-        if not self.up_pressed:
-            self.up_pressed = True
-            self.up_press_time = 0
+        self.load_sprites()
+        self.sim.start_spawning()
     
     def on_up_release(self, event):
-        self.up_pressed = False
-        self.up_press_time = 0
+        self.sim.stop_spawning()
         # Just reset the timer, don't clear pigs anymore
     
     def on_down_press(self, event):
         """Reset the screen when DOWN is pressed"""
+        if self.autosave_path is not None and self.animals:
+            self.save_to(self.autosave_path)  # F8 brings them back
         self.repaint_screen()
     
+    def save_scene(self, event=None):
+        """Save every animal, the layout and the random state to the snapshot file"""
+        self.save_to(self.snapshot_path)
+    
+    def restore_scene(self, event=None):
+        """Replace the animals with the ones in the snapshot file"""
+        self.restore_from(self.snapshot_path)
+    
+    def undo_reset(self, event=None):
+        """Bring back the animals the last DOWN cleared, if autosave is on"""
+        if self.autosave_path is not None:
+            self.restore_from(self.autosave_path)
+    
+    def save_to(self, path):
+        try:
+            count = save_snapshot(self.sim, path)
+        except OSError as error:
+            print(f"Could not save {path} ({error}).")
+            return
+        print(f"Saved {count} animals to {path}")  # Debug output
+    
+    def restore_from(self, path):
+        self.load_sprites()
+        try:
+            count = load_snapshot(self.sim, path)
+        except (OSError, ValueError) as error:
+            print(f"Could not restore {path} ({error}).")
+            return
+        print(f"Restored {count} animals from {path}")  # Debug output
+    
+    def on_click(self, event):
+        """Remove the animal under the mouse pointer"""
+        for item_id in self.canvas.find_withtag('current'):
+            handle = self.animals.find_by_item(item_id)
+            if handle is not None:
+                self.sim.remove_handle(handle)
+                return
+        # No canvas item per animal (framebuffer), ask the grid instead
+        hits = self.sim.grid.query_point(event.x, event.y)
+        if hits:
+            # Animals are drawn in store order, so the highest index is on top
+            self.sim.remove_handle(max(hits, key=self.animals.index))
+    
+    def toggle_collisions(self, event=None):
+        """Switch pushing overlapping animals apart on or off"""
+        self.sim.collisions = not self.sim.collisions
+        print(f"Collisions {'on' if self.sim.collisions else 'off'}")  # Debug output
+    
+    def toggle_profiler(self, event=None):
+        """Show or hide the frame timing overlay"""
+        self.show_profiler = not self.show_profiler
+        self.profiler.enabled = self.show_profiler or self.profiler.log_path is not None
+        if not self.show_profiler:
+            self.commands.delete("profiler")
+    
+    def draw_profiler_overlay(self):
+        """Redraw the timing overlay, at most four times a second"""
+        now = self.profiler.clock()
+        if now - self.profiler_drawn_at < 0.25:
+            return
+        self.profiler_drawn_at = now
+        lines = self.profiler.summary_lines()
+        if self.renderer.pool is not None:
+            lines.append(self.renderer.pool.stats_text())
+        if self.renderer.lod is not None:
+            lines.append(self.renderer.lod_text())
+        if self.sprites is not None:
+            lines.append(self.sprites.stats_text())
+        if self.sim.budget is not None:
+            lines.append(self.sim.budget.stats_text())
+        if self.sim.physics is not None:
+            lines.append(self.sim.physics.stats_text())
+        if self.quality is not None:
+            lines.append(self.quality.stats_text())
+        self.commands.delete("profiler")
+        self.commands.create_text(10, 10, text="\n".join(lines), anchor='nw',
+                                  font=("Courier", 11), fill="black", tags="profiler")
+    
     def create_animal(self):
-        # Use current line position instead of random
-        x = self.current_x
-        y = self.current_y
-        size = random.randint(15, 80)  # Much wider size range: tiny to large
-        
-        # Different animals with their characteristic colors
-        animals = [
-            {'type': 'pig', 'colors': ['hotpink', 'pink', 'lightpink', 'deeppink'], 'symbol': '🐷'},
-            {'type': 'sheep', 'colors': ['white', 'lightgray', 'ivory', 'snow'], 'symbol': '🐑'},
-            {'type': 'lion', 'colors': ['gold', 'orange', 'goldenrod', 'darkorange'], 'symbol': '🦁'},
-            {'type': 'cow', 'colors': ['black', 'white', 'gray', 'darkgray'], 'symbol': '🐄'},
-            {'type': 'elephant', 'colors': ['gray', 'lightgray', 'darkgray', 'silver'], 'symbol': '🐘'},
-            {'type': 'tiger', 'colors': ['orange', 'darkorange', 'coral', 'orangered'], 'symbol': '🐅'},
-            {'type': 'horse', 'colors': ['brown', 'tan', 'chocolate', 'peru'], 'symbol': '🐴'},
-            {'type': 'zebra', 'colors': ['black', 'white', 'darkslategray'], 'symbol': '🦓'},
-            {'type': 'giraffe', 'colors': ['yellow', 'gold', 'khaki', 'palegoldenrod'], 'symbol': '🦒'},
-            {'type': 'bear', 'colors': ['brown', 'saddlebrown', 'chocolate', 'sienna'], 'symbol': '🐻'}
-        ]
-        
-        # Randomly select an animal type
-        animal = random.choice(animals)
-        color = random.choice(animal['colors'])
-        
-        # Update position for next animal
-        self.current_x += self.animal_spacing * self.line_direction
-        
-        # Check if we need to start a new line
-        if self.current_x > self.screen_width - 100 and self.line_direction == 1:
-            # Hit right edge, start new line going left
-            self.current_y += self.line_height_increment
-            self.current_x = self.screen_width - 100
-            self.line_direction = -1
-        elif self.current_x < 100 and self.line_direction == -1:
-            # Hit left edge, start new line going right
-            self.current_y += self.line_height_increment
-            self.current_x = 100
-            self.line_direction = 1
-        
-        # Wrap around to top if we go too far down
-        if self.current_y > self.screen_height - 100:
-            self.current_y = 200
-            self.current_x = 100
-            self.line_direction = 1
-        
-        peppa = {
-            'x': x,
-            'y': y,
-            'speed_x': 0,  # No movement - set to 0
-            'speed_y': 0,  # No movement - set to 0
-            'size': size,
-            'color': color,
-            'animal_type': animal['type'],
-            'symbol': animal['symbol'],
-            'id': None,
-            'angle': random.uniform(0, 360),
-            'rotation_speed': 0,  # No rotation - set to 0
-            'bounce_factor': random.uniform(0.8, 1.2)
-        }
-        
-        # Create visual representation
-        if self.peppa_image:
-            peppa['id'] = self.canvas.create_image(x, y, image=self.peppa_image)
-            peppa['eyes'] = []  # No separate eyes for image
-        else:
-            # Create different shapes based on animal type
-            if animal['type'] in ['sheep', 'bear']:
-                # Round/fluffy animals - use circle
-                peppa['id'] = self.canvas.create_oval(
-                    x - size//2, y - size//2, x + size//2, y + size//2,
-                    fill=color, outline='darkred', width=2
-                )
-            elif animal['type'] in ['horse', 'giraffe', 'zebra']:
-                # Tall animals - use rectangle
-                peppa['id'] = self.canvas.create_rectangle(
-                    x - size//3, y - size//2, x + size//3, y + size//2,
-                    fill=color, outline='black', width=2
-                )
-            elif animal['type'] in ['lion', 'tiger']:
-                # Big cats - use diamond/polygon
-                points = [x, y-size//2, x+size//2, y, x, y+size//2, x-size//2, y]
-                peppa['id'] = self.canvas.create_polygon(
-                    points, fill=color, outline='brown', width=2
-                )
-            else:
-                # Default animals (pig, cow, elephant) - use oval
-                peppa['id'] = self.canvas.create_oval(
-                    x - size//2, y - size//2, x + size//2, y + size//2,
-                    fill=color, outline='darkred', width=2
-                )
-            
-            # Add eyes for all animals
-            eye_size = max(2, size // 8)
-            left_eye = self.canvas.create_oval(
-                x - size//4, y - size//3, x - size//4 + eye_size, y - size//3 + eye_size,
-                fill='black', outline=''
-            )
-            right_eye = self.canvas.create_oval(
-                x + size//6, y - size//3, x + size//6 + eye_size, y - size//3 + eye_size,
-                fill='black', outline=''
-            )
-            peppa['eyes'] = [left_eye, right_eye]
-        
-        # Add the animal to our list
-        self.animals.append(peppa)
+        """Add one animal at the next spot of the line layout"""
+        self.sim.create_animal()
+    
+    def create_animals(self, count):
+        """Add a batch of animals along the line layout in one pass"""
+        self.sim.create_animals(count)
         
     def remove_animal(self):
         """Remove a random animal from the screen"""
-        if self.animals:
-            # Remove a random animal
-            animal_to_remove = random.choice(self.animals)
-            
-            # Remove the visual element from canvas
-            if animal_to_remove['id']:
-                self.canvas.delete(animal_to_remove['id'])
-                
-            # Remove associated eyes if they exist
-            if 'eyes' in animal_to_remove:
-                for eye_id in animal_to_remove['eyes']:
-                    self.canvas.delete(eye_id)
-            
-            # Remove from the list
-            self.animals.remove(animal_to_remove)
+        self.sim.remove_animal()
     
     def clear_all_animals(self):
         """Remove all animals from the screen"""
-        for animal in self.animals[:]:  # Copy list to avoid modification during iteration
-            # Remove the visual element from canvas
-            if animal['id']:
-                self.canvas.delete(animal['id'])
-                
-            # Remove associated eyes if they exist
-            if 'eyes' in animal:
-                for eye_id in animal['eyes']:
-                    self.canvas.delete(eye_id)
-        
-        # Clear the entire list
-        self.animals.clear()
+        self.sim.clear()
         print(f"Cleared all animals! Count now: {len(self.animals)}")  # Debug output
     
     def repaint_screen(self):
@@ -238,117 +299,178 @@ class PeppaPigSpawner:
         self.clear_all_animals()
         
         # Reset line position variables
-        self.current_x = 100
-        self.current_y = 200
-        self.line_direction = 1
+        self.sim.reset_layout()
         
-        # Clear the entire canvas
-        self.canvas.delete("all")
+        # Clear the canvas, except the hidden animal items kept for reuse and the HUD
+        self.commands.delete(f"!(pooled||{HUD_TAG})")
+        self.renderer.reset()
+        self.hud.raise_to_top()
+        self.renderer.items_raised = False
         
         # Repaint the background color
         self.canvas.configure(bg='lightblue')
         
-        # Redraw the instructions
-        center_x = self.screen_width // 2
-        self.canvas.create_text(center_x, 30, text="Hold UP arrow to spawn Animals!", 
-                               font=("Arial", 16, "bold"), fill="white")
-        self.canvas.create_text(center_x, 55, text="Press DOWN to reset screen! Press ESC to exit fullscreen!", 
-                               font=("Arial", 12), fill="white")
-        
         print("Screen repainted!")  # Debug output
     
-    def update_animals(self, dt):
-        for i, animal in enumerate(self.animals[:]):  # Copy list to avoid modification during iteration
-            # Update position
-            animal['x'] += animal['speed_x'] * dt
-            animal['y'] += animal['speed_y'] * dt
-            
-            # Update rotation
-            animal['angle'] += animal['rotation_speed'] * dt
-            
-            # Bounce off walls with some variation
-            if animal['x'] <= animal['size']//2 or animal['x'] >= self.screen_width - animal['size']//2:
-                animal['speed_x'] *= -animal['bounce_factor']
-            if animal['y'] <= 100 or animal['y'] >= self.screen_height - animal['size']//2:
-                animal['speed_y'] *= -animal['bounce_factor']
-            
-            # Keep within bounds
-            animal['x'] = max(animal['size']//2, min(self.screen_width - animal['size']//2, animal['x']))
-            animal['y'] = max(100, min(self.screen_height - animal['size']//2, animal['y']))
-            
-            # Update visual position
-            if self.peppa_image:
-                self.canvas.coords(animal['id'], animal['x'], animal['y'])
-            else:
-                # Update main body
-                self.canvas.coords(animal['id'], 
-                                 animal['x'] - animal['size']//2, animal['y'] - animal['size']//2,
-                                 animal['x'] + animal['size']//2, animal['y'] + animal['size']//2)
-                # Update eyes if they exist
-                if 'eyes' in animal and len(animal['eyes']) >= 2:
-                    eye_size = animal['size'] // 8
-                    # Left eye
-                    self.canvas.coords(animal['eyes'][0],
-                                     animal['x'] - animal['size']//4, animal['y'] - animal['size']//3,
-                                     animal['x'] - animal['size']//4 + eye_size, animal['y'] - animal['size']//3 + eye_size)
-                    # Right eye  
-                    self.canvas.coords(animal['eyes'][1],
-                                     animal['x'] + animal['size']//6, animal['y'] - animal['size']//3,
-                                     animal['x'] + animal['size']//6 + eye_size, animal['y'] - animal['size']//3 + eye_size)
+    def simulate(self, dt):
+        """Advance the game by one fixed timestep"""
+        # Handle UP key being held down
+        with self.profiler.phase('spawn'):
+            self.sim.spawn(dt)
+        
+        # Update all Animals
+        with self.profiler.phase('update'):
+            self.sim.update(dt)
     
     def game_loop(self):
-        current_time = time.time()
-        dt = current_time - self.last_time
-        self.last_time = current_time
+        self.profiler.begin_frame()
+        if self.quality is not None:
+            self.quality.begin_frame()
         
-        # Handle UP key being held down
-        if self.up_pressed:
-            self.up_press_time += dt
-            # Spawn rate increases with time held (exponential growth) - MUCH FASTER!
-            spawn_rate = 15  # Increased from 5 to 15 spawns per second
-            
-            # Spawn Peppa Pigs based on spawn rate
-            if random.random() < spawn_rate * dt:
-                self.create_animal()
+        # Run the simulation steps that are due this frame
+        for _ in range(self.scheduler.begin_frame()):
+            self.simulate(self.scheduler.timestep)
         
-        # Update all Animals
-        self.update_animals(dt)
+        # Update visual positions of the animals that changed
+        with self.profiler.phase('render'):
+            self.renderer.sync(self.animals)
+        
+        with self.profiler.phase('hud'):
+            self.draw_stats()
+        if self.show_profiler:
+            self.draw_profiler_overlay()
+        
+        # Send this frame's canvas changes to Tcl in bulk
+        with self.profiler.phase('flush'):
+            self.commands.flush()
+            self.animals.resolve_items()  # Index the canvas ids the new items just got
+        
+        # Let Tk redraw now while profiling, so its idle work shows up as a phase
+        if self.profiler.enabled:
+            with self.profiler.phase('tk_idle'):
+                self.root.update_idletasks()
+        self.profiler.end_frame()
+        if self.quality is not None:
+            self.quality.end_frame()
+        
+        # Schedule next frame within what is left of the frame budget
+        self.scheduler.end_frame()
+    
+    def draw_stats(self):
+        """Update the stats line and the bottom banner"""
+        # New and reused animal items are drawn above the HUD, put it back on top
+        if self.renderer.items_raised:
+            self.hud.raise_to_top()
+            self.renderer.items_raised = False
         
         # Update stats display
-        self.canvas.delete("stats")
-        center_x = self.screen_width // 2
-        spawn_rate = 15 if self.up_pressed else 0
-        stats_text = f"Animals: {len(self.animals)}"
-        if self.up_pressed:
-            stats_text += f" | UP Hold Time: {self.up_press_time:.1f}s | Spawn Rate: {spawn_rate:.1f}/s"
-        self.canvas.create_text(center_x, 80, text=stats_text, font=("Arial", 14), 
-                               fill="white", tags="stats")
+        spawn_rate = self.sim.spawn_rate
+        stats_text = f"Animals: {len(self.animals)} | Redrawn: {self.renderer.pushed} Skipped: {self.renderer.skipped}"
+        stats_text += f" | FPS: {self.scheduler.fps:.0f} Missed: {self.scheduler.missed_deadlines}"
+        if self.sim.spawning:
+            stats_text += f" | UP Hold Time: {self.sim.hold_time:.1f}s | Spawn Rate: {spawn_rate:.1f}/s"
+        self.hud.set('stats', stats_text)
         
         # Add some visual feedback when keys are pressed
-        center_x = self.screen_width // 2
-        bottom_y = self.screen_height - 50
-        if self.up_pressed:
-            self.canvas.create_text(center_x, bottom_y, text="SPAWNING ANIMALS! Press DOWN to reset screen!", 
-                                   font=("Arial", 16, "bold"), fill="yellow", tags="stats")
+        if self.sim.spawning:
+            self.hud.set('banner', "SPAWNING ANIMALS! Press DOWN to reset screen!",
+                         font=("Arial", 16, "bold"), fill="yellow")
         elif self.animals:
-            self.canvas.create_text(center_x, bottom_y, text="Hold UP to spawn more animals! Press DOWN to reset!", 
-                                   font=("Arial", 14), fill="lightgreen", tags="stats")
+            self.hud.set('banner', "Hold UP to spawn more animals! Press DOWN to reset!",
+                         font=("Arial", 14), fill="lightgreen")
         else:
-            self.canvas.create_text(center_x, bottom_y, text="Hold UP to spawn animals! Press DOWN to reset!", 
-                                   font=("Arial", 14), fill="lightblue", tags="stats")
-        
-        # Schedule next frame
-        self.root.after(16, self.game_loop)  # ~60 FPS
+            self.hud.set('banner', "Hold UP to spawn animals! Press DOWN to reset!",
+                         font=("Arial", 14), fill="lightblue")
     
     def run(self):
         print("FULLSCREEN ANIMAL SPAWNER!")
         print("Hold UP arrow key to spawn different animals!")
-        print("Animals: Pigs🐷, Sheep🐑, Lions🦁, Cows🐄, Elephants🐘, Tigers🐅, Horses🐴, Zebras🦓, Giraffes🦒, Bears🐻")
+        print("Animals: " + ", ".join(f"{species.name.capitalize()} {species.symbol}" for species in self.catalog))
         print("Press DOWN arrow key to reset the screen!")
+        print("Click an animal to make it disappear!")
+        print("Press C to make animals push each other apart.")
+        print("Press F3 to show frame timings.")
+        print(f"Press F5 to save the animals, F9 to bring them back ({self.snapshot_path}).")
+        if self.autosave_path is not None:
+            print(f"Press F8 to undo the last reset ({self.autosave_path}).")
         print("Press ESC to exit fullscreen, or close window to exit.")
+        self.start()
         self.root.mainloop()
+        self.shutdown()
+    
+    def shutdown(self):
+        """Stop the physics worker and write the logs"""
+        if self.sim.physics is not None:
+            self.sim.physics.close()
+            self.sim.physics = None
+        self.profiler.dump()
+        if self.quality is not None:
+            self.quality.dump()
+    
+    def close(self):
+        """Take the game off the window, leaving no canvas items, bindings or timers behind"""
+        self.scheduler.stop()
+        self.sim.stop_spawning()
+        self.shutdown()
+        for sequence, funcid in self.bindings:
+            self.root.unbind(sequence, funcid)
+        self.canvas.destroy()  # Takes every item with it, pooled ones included
+        self.sprites = self.renderer.sprites = None
+        if self.owns_root:
+            self.root.destroy()
+    
+    def quit_game(self, event=None):
+        """Leave the game and go back to the launcher"""
+        self.close()
+        self.on_quit()
 
 # Create and run the game
 if __name__ == "__main__":
-    game = PeppaPigSpawner()
+    parser = argparse.ArgumentParser(description="Fullscreen animal spawner")
+    parser.add_argument('--backend', choices=['canvas', 'framebuffer'], default='canvas',
+                        help="draw animals as canvas items or into one pixel buffer")
+    parser.add_argument('--fps', type=int, default=60, help="target frame rate")
+    parser.add_argument('--profile-log', metavar='PATH',
+                        help="write per-frame phase timings to PATH (.csv or .jsonl) on exit, the last 36000 frames")
+    parser.add_argument('--spawn-rate', type=float, default=15, help="animals per second when UP is first held")
+    parser.add_argument('--max-spawn-rate', type=float, default=500, help="spawn rate ceiling while ramping up")
+    parser.add_argument('--ramp-hold', type=float, default=2.0, help="seconds at the starting rate before ramping")
+    parser.add_argument('--ramp-doubling', type=float, default=2.0, help="seconds for the spawn rate to double")
+    parser.add_argument('--pool-size', type=int, default=10000,
+                        help="most hidden canvas items of each shape kept for reuse")
+    parser.add_argument('--eye-min-size', type=int, default=24, help="animals smaller than this are drawn without eyes")
+    parser.add_argument('--marker-count', type=int, default=20000,
+                        help="draw every animal as a single pixel from this many animals on")
+    parser.add_argument('--max-animals', type=int, help="evict animals to stay at or below this many")
+    parser.add_argument('--max-memory-mb', type=float, help="evict animals to stay under this estimated memory")
+    parser.add_argument('--eviction', choices=sorted(EVICTION_POLICIES), default='oldest',
+                        help="which animals to evict when over budget")
+    parser.add_argument('--species', metavar='PATH', help="load the animal species from a JSON file")
+    parser.add_argument('--adaptive-quality', action='store_true',
+                        help="lower detail, HUD rate and spawn rate when frames run long")
+    parser.add_argument('--max-quality-level', type=int, choices=range(len(QUALITY_LEVELS)),
+                        help="lowest quality level the adaptive quality may drop to")
+    parser.add_argument('--quality-log', metavar='PATH',
+                        help="write the adaptive quality decisions to PATH (JSONL) on exit")
+    parser.add_argument('--snapshot', metavar='PATH', default='spawner.snapshot',
+                        help="file F5 saves the animals to and F9 restores them from")
+    parser.add_argument('--restore', action='store_true', help="start with the animals saved in the snapshot file")
+    parser.add_argument('--autosave', action='store_true',
+                        help="save the animals DOWN clears to PATH.autosave, F8 brings them back")
+    parser.add_argument('--physics', choices=('main',) + PHYSICS_MODES, default='main',
+                        help="step the physics in the game loop, a worker thread or a worker process")
+    args = parser.parse_args()
+    catalog = SpeciesCatalog.from_file(args.species) if args.species else None
+    budget = None
+    if args.max_animals is not None or args.max_memory_mb is not None:
+        max_bytes = int(args.max_memory_mb * 1024 * 1024) if args.max_memory_mb is not None else None
+        budget = EntityBudget(args.max_animals, max_bytes, policy=args.eviction)
+    schedule = SpawnSchedule(args.spawn_rate, args.max_spawn_rate, args.ramp_hold, args.ramp_doubling)
+    game = PeppaPigSpawner(backend=args.backend, target_fps=args.fps, profile_log=args.profile_log,
+                           schedule=schedule, pool_ceiling=args.pool_size,
+                           lod=LodPolicy(eye_min_size=args.eye_min_size, marker_count=args.marker_count),
+                           budget=budget, catalog=catalog, physics=args.physics,
+                           adaptive_quality=args.adaptive_quality, max_quality_level=args.max_quality_level,
+                           quality_log=args.quality_log, snapshot_path=args.snapshot, restore=args.restore,
+                           autosave=args.autosave)
     game.run()
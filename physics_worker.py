@@ -0,0 +1,312 @@
+"""Runs the physics step in a worker process or thread instead of the Tk loop.
+
+The worker keeps a mirror of the animals (a headless SpawnerSimulation),
+steps it on its own fixed-timestep clock and publishes the positions
+into shared memory. The Tk loop stays the owner of the animals: spawning,
+removals and clears happen there as before and are forwarded to the
+worker as one batch of changes per frame.
+
+Positions are double-buffered. Two slabs of x and y columns live in one
+SharedMemory block, and a small control block records which slab was
+published last (`FRONT`) and which one the Tk loop is reading
+(`READING`). The worker always writes the slab the Tk loop is not
+reading, and takes it back from `FRONT` while rewriting it, so the Tk
+loop never sees a half-written frame. Neither side waits for the other:
+the lock only guards a few integers and the Tk loop only tries it. The
+Tk loop adopts a slab by binding the store's x and y columns to it, so
+no positions are copied. A frame published before the latest batches of
+changes reached the worker is still adopted: its rows are put in the
+store's order and the animals added since keep their own positions. If
+the worker falls behind, the animals stay where they were drawn last.
+"""
+import multiprocessing
+import queue
+from collections import deque
+import threading
+import time
+from multiprocessing import shared_memory
+
+from entity_store import np
+from spawner_core import SpawnerSimulation
+
+# Fields of the control block, one int64 each
+FRONT, READING, SEQ, COUNT, STEPS = range(5)
+CONTROL_FIELDS = 5
+
+# x and y, per slab
+SLAB_COLUMNS = ('x', 'y')
+
+PHYSICS_MODES = ('process', 'thread')
+
+
+def _slabs(memory, capacity):
+    return np.ndarray((2, len(SLAB_COLUMNS), capacity), dtype=np.float64, buffer=memory.buf)
+
+
+def run_worker(commands, lock, control_name, width, height, timestep, max_steps=5):
+    """Worker side: mirror the animals, step them and publish their positions.
+
+    `commands` delivers (seq, changes) batches, and None to stop.
+    """
+    control_memory = shared_memory.SharedMemory(name=control_name)
+    control = np.ndarray(CONTROL_FIELDS, dtype=np.int64, buffer=control_memory.buf)
+    sim = SpawnerSimulation(width, height, use_numpy=True)
+    sim.enable_grid()
+    animals = sim.animals
+    memory = slabs = None
+    seq = 0
+    changed = False
+    next_step = time.monotonic()
+    try:
+        while True:
+            try:
+                batch = commands.get(timeout=max(0.0, next_step - time.monotonic()))
+            except queue.Empty:
+                batch = ()
+            if batch is None:
+                break
+            if batch:
+                seq, changes = batch
+                for change in changes:
+                    kind = change[0]
+                    if kind == 'add':
+                        _, xs, ys, sizes, angles, bounces, speed_xs, speed_ys, rotations = change
+                        n = len(xs)
+                        start = animals.extend(xs, ys, sizes, [''] * n, [''] * n, [''] * n,
+                                               [None] * n, [()] * n, angles, bounces)
+                        animals.column('speed_x')[start:] = speed_xs
+                        animals.column('speed_y')[start:] = speed_ys
+                        animals.column('rotation_speed')[start:] = rotations
+                        sim.grid.insert_rows(start, start + n)
+                    elif kind == 'remove':
+                        sim.remove_index(change[1])
+                    elif kind == 'clear':
+                        sim.clear()
+                    elif kind == 'collisions':
+                        sim.collisions = change[1]
+                    elif kind == 'buffers':
+                        slabs = None
+                        if memory is not None:
+                            memory.close()
+                        try:
+                            memory = shared_memory.SharedMemory(name=change[1])
+                            slabs = _slabs(memory, change[2])
+                        except FileNotFoundError:
+                            memory = None  # Already replaced again, the next 'buffers' follows
+                changed = True
+
+            # Catch up on the steps that are due, dropping time beyond max_steps
+            now = time.monotonic()
+            steps = 0
+            while now >= next_step and steps < max_steps:
+                sim.update(timestep)
+                next_step += timestep
+                steps += 1
+            if now >= next_step:
+                next_step = now + timestep
+            control[STEPS] += steps
+            if (steps or changed) and slabs is not None:
+                _publish(control, lock, slabs, animals, seq)
+                changed = False
+    finally:
+        slabs = control = None
+        if memory is not None:
+            memory.close()
+        control_memory.close()
+
+
+def _publish(control, lock, slabs, animals, seq):
+    """Write the positions into the slab the Tk loop is not reading and make it the front one"""
+    with lock:
+        target = 1 - control[READING] if control[READING] >= 0 else 0
+        if control[FRONT] == target:
+            control[FRONT] = -1  # Not ready to be read while it is rewritten
+    count = len(animals)
+    for column, name in enumerate(SLAB_COLUMNS):
+        slabs[target, column, :count] = animals.column(name)
+    with lock:
+        control[FRONT] = target
+        control[SEQ] = seq
+        control[COUNT] = count
+
+
+class PhysicsWorker:
+    """Steps a SpawnerSimulation's animals in a worker process or thread.
+
+    Set it as `sim.physics`; the simulation then reports its changes
+    through `added`, `removed` and `cleared`, and `collect` (called from
+    `sim.update`) sends them and picks up the newest published positions.
+    `mode` is 'process', which runs in parallel with Tk, or 'thread',
+    which only overlaps while NumPy releases the GIL. Needs NumPy.
+    """
+
+    def __init__(self, sim, mode='process', timestep=1 / 60):
+        if np is None or not sim.animals.use_numpy:
+            raise RuntimeError("the physics worker needs NumPy")
+        if mode not in PHYSICS_MODES:
+            raise ValueError(f"unknown physics mode {mode!r}, expected one of {PHYSICS_MODES}")
+        self.mode = mode
+        self.animals = sim.animals
+        self.control_memory = shared_memory.SharedMemory(create=True, size=CONTROL_FIELDS * 8)
+        self.control = np.ndarray(CONTROL_FIELDS, dtype=np.int64, buffer=self.control_memory.buf)
+        self.control[:] = (-1, -1, 0, 0, 0)
+        self.memory = None
+        self.slabs = None
+        self.capacity = 0
+        self.pending = []  # Changes not sent to the worker yet
+        self.seq = 0
+        self.unconfirmed = deque()  # (seq, row changes) of batches sent but not seen in a frame yet
+        self.buffers_seq = 0  # Batch that moved the worker to the current slabs
+        self.collisions = None
+        self.adopted = 0  # Frames taken from the worker
+        self.busy = 0  # Frames the lock was taken, so the last positions were kept
+        self.steps = 0
+
+        if mode == 'process':
+            context = multiprocessing.get_context('spawn')
+            self.commands, self.lock = context.Queue(), context.Lock()
+            start = context.Process
+        else:
+            self.commands, self.lock = queue.SimpleQueue(), threading.Lock()
+            start = threading.Thread
+        self._resize(self.animals.capacity)
+        if self.animals:
+            self.added(sim, 0, len(self.animals))
+        self.worker = start(target=run_worker, daemon=True,
+                            args=(self.commands, self.lock, self.control_memory.name, sim.width,
+                                  sim.height, timestep))
+        self.worker.start()
+
+    def _resize(self, capacity):
+        """Move to bigger slabs; the store columns are private until the next frame"""
+        with self.lock:
+            self.control[FRONT] = self.control[READING] = -1
+        self.slabs = None
+        if self.memory is not None:
+            self._unbind()
+            self.memory.close()
+            self.memory.unlink()
+        self.capacity = max(capacity, self.capacity * 2, 1024)
+        size = 2 * len(SLAB_COLUMNS) * self.capacity * 8
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+        self.slabs = _slabs(self.memory, self.capacity)
+        self.pending.append(('buffers', self.memory.name, self.capacity))
+
+    def _unbind(self):
+        """Give the store columns of its own again, in case they point into the slabs"""
+        animals = self.animals
+        for name in SLAB_COLUMNS:
+            data = np.zeros(animals.capacity, dtype=np.float64)
+            data[:len(animals)] = animals.column(name)
+            animals.bind_column(name, data)
+
+    def added(self, sim, start, count):
+        animals = self.animals
+        if animals.capacity > self.capacity:
+            self._resize(animals.capacity)
+        stop = start + count
+        self.pending.append(('add',) + tuple(
+            animals.column(name)[start:stop].tolist()
+            for name in ('x', 'y', 'size', 'angle', 'bounce_factor', 'speed_x', 'speed_y', 'rotation_speed')))
+
+    def removed(self, index):
+        self.pending.append(('remove', index))
+
+    def cleared(self):
+        self.pending.append(('clear',))
+
+    def collect(self, sim):
+        """Send this frame's changes and adopt the newest positions, never waits.
+
+        Returns True if new positions were adopted.
+        """
+        if sim.collisions != self.collisions:
+            self.collisions = sim.collisions
+            self.pending.append(('collisions', sim.collisions))
+        if self.pending:
+            self.seq += 1
+            self.commands.put((self.seq, self.pending))
+            if any(change[0] == 'buffers' for change in self.pending):
+                self.buffers_seq = self.seq
+            self.unconfirmed.append((self.seq, [change for change in self.pending
+                                                if change[0] in ('add', 'remove', 'clear')]))
+            self.pending = []
+        if not self.lock.acquire(False):
+            self.busy += 1
+            return False
+        try:
+            control = self.control
+            front = int(control[FRONT])
+            seq, count = int(control[SEQ]), int(control[COUNT])
+            # Frames from before the current slabs were written somewhere else
+            fresh = front >= 0 and front != control[READING] and self.buffers_seq <= seq <= self.seq
+            if fresh:
+                source = self._rows_since(seq, count)
+                fresh = source is not None
+            if fresh and source is not True:
+                # Keep the positions of the rows the worker does not have yet, before the
+                # slab bound now is handed back to the worker
+                kept = source < 0
+                newer = [self.animals.column(name)[kept] for name in SLAB_COLUMNS]
+            if fresh:
+                control[READING] = front
+            self.steps = int(control[STEPS])
+        finally:
+            self.lock.release()
+        if not fresh:
+            return False
+        while self.unconfirmed and self.unconfirmed[0][0] <= seq:
+            self.unconfirmed.popleft()
+        for column, name in enumerate(SLAB_COLUMNS):
+            data = self.slabs[front, column]
+            if source is not True:
+                # The frame is a few batches behind: put its rows where the store has them now
+                values = data[np.maximum(source, 0)]
+                values[kept] = newer[column]
+                data[:len(values)] = values
+            self.animals.bind_column(name, data)
+        if sim.grid is not None:
+            sim.grid.sync(self.animals.dirty_indices())
+        self.adopted += 1
+        return True
+
+    def _rows_since(self, seq, count):
+        """Which row of a frame published after batch `seq` each store row is now.
+
+        True if the frame has every batch applied, None if it does not
+        match the store, otherwise an array with -1 for rows added since.
+        """
+        if seq == self.seq:
+            return True if count == len(self.animals) else None
+        source = np.arange(count)
+        for sent, changes in self.unconfirmed:
+            if sent <= seq:
+                continue
+            for change in changes:
+                kind = change[0]
+                if kind == 'add':
+                    source = np.concatenate((source, np.full(len(change[1]), -1)))
+                elif kind == 'remove':
+                    # Same swap-remove as the store
+                    source[change[1]] = source[-1]
+                    source = source[:-1]
+                else:
+                    source = source[:0]
+        return source if len(source) == len(self.animals) else None
+
+    def close(self):
+        """Stop the worker and free the shared memory"""
+        self.commands.put(None)
+        self.worker.join(timeout=1.0)
+        if self.mode == 'process' and self.worker.is_alive():
+            self.worker.terminate()
+        self._unbind()
+        self.slabs = self.control = None
+        self.memory.close()
+        self.memory.unlink()
+        self.control_memory.close()
+        self.control_memory.unlink()
+
+    def stats_text(self):
+        return (f"physics: {self.mode} worker, {self.steps} steps, {self.adopted} frames adopted, "
+                f"{self.busy} busy")
@@ -0,0 +1,122 @@
+import json
+import time
+
+# Knob settings per quality level, from full quality to the cheapest.
+# Level 0 is the game as configured, so its eye_min_size of None keeps the configured one.
+QUALITY_LEVELS = (
+    {'hud_rate': 10, 'sync_limit': None, 'spawn_scale': 1.0, 'eye_min_size': None},
+    {'hud_rate': 5, 'sync_limit': None, 'spawn_scale': 1.0, 'eye_min_size': 40},
+    {'hud_rate': 2, 'sync_limit': 5000, 'spawn_scale': 0.5, 'eye_min_size': 60},
+    {'hud_rate': 1, 'sync_limit': 2000, 'spawn_scale': 0.25, 'eye_min_size': 81},
+)
+
+
+class QualityController:
+    """Lowers and raises the quality level to hold the target frame rate.
+
+    Wrap each frame in `begin_frame()`/`end_frame()`. A frame costs the time
+    spent in it, or the time since the previous frame started when that
+    overran the frame budget (Tk's own redrawing happens between frames).
+    `load` is a moving average of cost / budget, with `smoothing` the
+    weight of the newest frame.
+
+    When `load` stays above `degrade_at` for `degrade_after` seconds the
+    level goes one step down `levels`, up to `max_level`; when it stays
+    below `improve_at` for `improve_after` seconds it goes one step back up.
+    The gap between the two thresholds and the longer wait before
+    improving keep it from flipping back and forth. Each level's settings
+    are handed to `knobs`, a dict of knob name -> function taking the new
+    value; settings without a knob are ignored. Every decision is kept in
+    `decisions` and written to `log_path` (JSONL) by `dump()`.
+    """
+
+    def __init__(self, knobs, target_fps=60, levels=QUALITY_LEVELS, max_level=None,
+                 degrade_at=0.9, improve_at=0.6, degrade_after=0.5, improve_after=3.0,
+                 smoothing=0.1, log_path=None, clock=time.perf_counter):
+        self.knobs = knobs
+        self.levels = levels
+        self.max_level = len(levels) - 1 if max_level is None else min(max_level, len(levels) - 1)
+        self.degrade_at = degrade_at
+        self.improve_at = improve_at
+        self.degrade_after = degrade_after
+        self.improve_after = improve_after
+        self.smoothing = smoothing
+        self.log_path = log_path
+        self.clock = clock
+        self.set_target_fps(target_fps)
+        self.level = 0
+        self.load = 0.0
+        self.frame_start = None
+        self.period = 0.0
+        self.started_at = clock()
+        self.over_since = None
+        self.under_since = None
+        self.decisions = []
+        self.apply()
+
+    def set_target_fps(self, target_fps):
+        self.budget = 1.0 / target_fps
+
+    def apply(self):
+        """Hand the current level's settings to the knobs"""
+        for name, value in self.levels[self.level].items():
+            if name in self.knobs:
+                self.knobs[name](value)
+
+    def begin_frame(self):
+        now = self.clock()
+        self.period = now - self.frame_start if self.frame_start is not None else 0.0
+        self.frame_start = now
+
+    def end_frame(self):
+        now = self.clock()
+        cost = now - self.frame_start
+        if self.period > self.budget * 1.05:
+            cost = max(cost, self.period)
+        self.load += (cost / self.budget - self.load) * self.smoothing
+        self.decide(now, cost)
+
+    def decide(self, now, cost):
+        """Change level if the load has been out of band long enough"""
+        if self.load > self.degrade_at:
+            self.under_since = None
+            if self.over_since is None:
+                self.over_since = now
+            if now - self.over_since >= self.degrade_after and self.level < self.max_level:
+                self.change(self.level + 1, now, cost, "over budget")
+        elif self.load < self.improve_at:
+            self.over_since = None
+            if self.under_since is None:
+                self.under_since = now
+            if now - self.under_since >= self.improve_after and self.level > 0:
+                self.change(self.level - 1, now, cost, "headroom")
+        else:
+            self.over_since = self.under_since = None
+
+    def change(self, level, now, cost, reason):
+        decision = {
+            'time': round(now - self.started_at, 3),
+            'from': self.level,
+            'to': level,
+            'reason': reason,
+            'load': round(self.load, 3),
+            'frame_ms': round(cost * 1000, 2),
+            'settings': self.levels[level],
+        }
+        self.decisions.append(decision)
+        print(f"Quality {self.level} -> {level} ({reason}, load {self.load:.2f})")  # Debug output
+        self.level = level
+        self.over_since = self.under_since = None  # Wait a full period before the next step
+        self.apply()
+
+    def stats_text(self):
+        return f"quality: level {self.level}/{self.max_level}, load {self.load:.2f}, {len(self.decisions)} changes"
+
+    def dump(self):
+        """Write the decisions to `log_path`, one JSON object per line"""
+        if self.log_path is None or not self.decisions:
+            return
+        with open(self.log_path, 'w') as f:
+            for decision in self.decisions:
+                f.write(json.dumps(decision) + '\n')
+        print(f"Wrote {len(self.decisions)} quality decisions to {self.log_path}")
@@ -0,0 +1,172 @@
+"""Save and restore the whole spawner scene as one binary file.
+
+File layout:
+
+    magic            8 bytes, MAGIC
+    version          uint32, little-endian
+    header length    uint32, little-endian
+    header           JSON, see below
+    column data      every column's raw values, each starting at a multiple of 8
+
+The header holds the animal count, the layout cursor, the RNG state, the
+tables the interned columns index, and per column its name, array type
+code and byte offset from the start of the column data, in the byte order
+recorded in the header. Columns are found by name: a column missing from
+an older snapshot gets its default value, and a column stored with
+another type code is converted. Headers of older versions are brought up
+to date through UPGRADES.
+
+Loading memory-maps the file; with NumPy every column is read straight
+out of the mapping and copied into the store once.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from entity_store import np, FLOAT_COLUMNS, SINGLE_COLUMNS, INTERNED_COLUMNS
+
+MAGIC = b'PIGSNAP\0'
+SNAPSHOT_VERSION = 1
+
+_PREFIX = struct.Struct('<8sII')
+
+# Value of a float column missing from a snapshot, 0.0 if not listed
+COLUMN_DEFAULTS = {'bounce_factor': 1.0}
+
+# Snapshot version -> function turning a header of that version into the next version's
+UPGRADES = {}
+
+
+def _typecode(name):
+    return 'f' if name in SINGLE_COLUMNS else 'd'
+
+
+def _aligned(offset):
+    return (offset + 7) // 8 * 8
+
+
+def save_snapshot(sim, path):
+    """Write the animals, layout cursor and RNG state of `sim` to `path`, returns the count"""
+    animals = sim.animals
+    columns = [(name, _typecode(name), animals.column(name)) for name in FLOAT_COLUMNS]
+    columns += [(name, 'H', getattr(animals, name).codes) for name in INTERNED_COLUMNS]
+    header = {
+        'count': len(animals),
+        'byteorder': sys.byteorder,
+        'screen': [sim.width, sim.height],
+        'layout': {'current_x': sim.current_x, 'current_y': sim.current_y,
+                   'line_direction': sim.line_direction},
+        'rng': sim.rng.getstate(),
+        'interned': {name: getattr(animals, name).values for name in INTERNED_COLUMNS},
+        'columns': [],
+    }
+    offset = 0
+    for name, typecode, data in columns:
+        header['columns'].append({'name': name, 'type': typecode, 'offset': offset})
+        offset = _aligned(offset + len(animals) * array(typecode).itemsize)
+    encoded = json.dumps(header).encode('utf-8')
+    prefix = _PREFIX.pack(MAGIC, SNAPSHOT_VERSION, len(encoded)) + encoded
+
+    # Write next to the target and swap it in, so a crash never leaves half a snapshot
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, 'wb') as f:
+        f.write(prefix)
+        f.write(bytes(_aligned(len(prefix)) - len(prefix)))
+        for name, typecode, data in columns:
+            written = f.write(memoryview(data).cast('B'))
+            f.write(bytes(_aligned(written) - written))
+    os.replace(partial, path)
+    return len(animals)
+
+
+def _read_column(mapping, start, column, count, typecode, use_numpy, swap):
+    """One column out of the mapping as `typecode`, or None if it was not saved"""
+    if column is None:
+        return None
+    offset = start + column['offset']
+    stored = column['type']
+    if use_numpy:
+        values = np.frombuffer(mapping, dtype=stored, count=count, offset=offset)
+        if swap:
+            values = values.byteswap()
+        return values if stored == typecode else values.astype(typecode)
+    values = array(stored)
+    values.frombytes(mapping[offset:offset + count * values.itemsize])
+    if swap:
+        values.byteswap()
+    return values if stored == typecode else array(typecode, values)
+
+
+def _filled(typecode, value, count, use_numpy):
+    if use_numpy:
+        return np.full(count, value, dtype=typecode)
+    return array(typecode, [value]) * count
+
+
+def load_snapshot(sim, path):
+    """Replace the animals of `sim` with the ones saved in `path`, returns how many.
+
+    Raises ValueError, leaving `sim` as it was, if `path` is not a snapshot,
+    was written by a newer version or has species missing from the catalog.
+    """
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return _load(sim, path, mapping)
+    finally:
+        try:
+            mapping.close()
+        except BufferError:
+            pass  # A traceback still holds a view of it, it closes once that is gone
+
+
+def _load(sim, path, mapping):
+    if len(mapping) < _PREFIX.size:
+        raise ValueError(f"{path} is not an animal spawner snapshot")
+    magic, version, header_length = _PREFIX.unpack_from(mapping)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not an animal spawner snapshot")
+    if version > SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is snapshot version {version}, this version reads up to {SNAPSHOT_VERSION}")
+    header = json.loads(mapping[_PREFIX.size:_PREFIX.size + header_length])
+    while version < SNAPSHOT_VERSION:
+        header = UPGRADES[version](header)
+        version += 1
+
+    count = header['count']
+    start = _aligned(_PREFIX.size + header_length)
+    swap = header['byteorder'] != sys.byteorder
+    use_numpy = sim.animals.use_numpy
+    stored = {column['name']: column for column in header['columns']}
+    floats = {}
+    for name in FLOAT_COLUMNS:
+        typecode = _typecode(name)
+        values = _read_column(mapping, start, stored.get(name), count, typecode, use_numpy, swap)
+        if values is None:
+            values = _filled(typecode, COLUMN_DEFAULTS.get(name, 0.0), count, use_numpy)
+        floats[name] = values
+    interned = {}
+    for name in INTERNED_COLUMNS:
+        codes = _read_column(mapping, start, stored.get(name), count, 'H', use_numpy, swap)
+        if codes is None:
+            interned[name] = (_filled('H', 0, count, use_numpy), [''])
+        else:
+            interned[name] = (codes, header['interned'][name])
+
+    codes, table = interned['animal_type']
+    used = np.unique(codes).tolist() if use_numpy else set(codes)
+    missing = {table[code] for code in used} - set(sim.catalog.by_name)
+    if missing:
+        raise ValueError(f"{path} has species this catalog does not know: {', '.join(sorted(missing))}")
+
+    sim.clear()
+    layout = header['layout']
+    sim.current_x, sim.current_y = layout['current_x'], layout['current_y']
+    sim.line_direction = layout['line_direction']
+    version, state, gauss = header['rng']
+    sim.rng.setstate((version, tuple(state), gauss))
+    sim.add_columns(floats, interned)
+    return count
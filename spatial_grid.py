@@ -0,0 +1,176 @@
+import math
+
+# Cells whose pairs each cell checks against its own, so every pair of
+# neighbouring cells is visited exactly once
+_FORWARD_NEIGHBOURS = ((1, 0), (-1, 1), (0, 1), (1, 1))
+
+# Spreads animals that sit exactly on top of each other in different directions
+_GOLDEN_ANGLE = math.pi * (3 - math.sqrt(5))
+
+
+class SpatialGrid:
+    """Uniform hash grid over the animals of an EntityStore.
+
+    Animals are filed by the cell their center falls in, keyed by their
+    stable handle, so swap-removal in the store does not disturb the grid.
+    `move` only touches the cell sets when an animal actually crosses into
+    another cell. Queries read positions and sizes straight from the store.
+
+    `cell_size` should be at least the largest animal size: then anything
+    that can touch a point or overlap an animal is in the surrounding 3x3
+    cells.
+    """
+
+    def __init__(self, animals, cell_size=80):
+        self.animals = animals
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> set of handles
+        self.cell_of = {}  # handle -> (cx, cy)
+
+    def __len__(self):
+        return len(self.cell_of)
+
+    def cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, handle, x, y):
+        key = self.cell(x, y)
+        self.cell_of[handle] = key
+        members = self.cells.get(key)
+        if members is None:
+            members = self.cells[key] = set()
+        members.add(handle)
+
+    def insert_rows(self, start, stop):
+        """File the animals at store indices start..stop-1"""
+        animals = self.animals
+        xs, ys = animals.column('x'), animals.column('y')
+        for i in range(start, stop):
+            self.insert(animals.handle(i), xs[i], ys[i])
+
+    def remove(self, handle):
+        key = self.cell_of.pop(handle, None)
+        if key is None:
+            return
+        members = self.cells[key]
+        members.discard(handle)
+        if not members:
+            del self.cells[key]
+
+    def move(self, handle, x, y):
+        """Refile an animal after it moved, returns True if it changed cell"""
+        key = self.cell(x, y)
+        old = self.cell_of.get(handle)
+        if key == old:
+            return False
+        self.remove(handle)
+        self.insert(handle, x, y)
+        return True
+
+    def sync(self, indices):
+        """Refile the animals at `indices` (store indices) after they moved"""
+        animals = self.animals
+        xs, ys = animals.column('x'), animals.column('y')
+        for i in indices:
+            self.move(animals.handle(i), xs[i], ys[i])
+
+    def clear(self):
+        self.cells.clear()
+        self.cell_of.clear()
+
+    def _handles_in_cells(self, cx0, cy0, cx1, cy1):
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                members = cells.get((cx, cy))
+                if members:
+                    yield from members
+
+    def query_rect(self, x0, y0, x1, y1):
+        """Handles of the animals whose center lies inside the rectangle"""
+        animals = self.animals
+        xs, ys = animals.column('x'), animals.column('y')
+        cx0, cy0 = self.cell(x0, y0)
+        cx1, cy1 = self.cell(x1, y1)
+        found = []
+        for handle in self._handles_in_cells(cx0, cy0, cx1, cy1):
+            i = animals.index(handle)
+            if x0 <= xs[i] <= x1 and y0 <= ys[i] <= y1:
+                found.append(handle)
+        return found
+
+    def query_radius(self, x, y, radius):
+        """Handles of the animals whose center is within `radius` of (x, y)"""
+        animals = self.animals
+        xs, ys = animals.column('x'), animals.column('y')
+        cx0, cy0 = self.cell(x - radius, y - radius)
+        cx1, cy1 = self.cell(x + radius, y + radius)
+        found = []
+        limit = radius * radius
+        for handle in self._handles_in_cells(cx0, cy0, cx1, cy1):
+            i = animals.index(handle)
+            dx, dy = xs[i] - x, ys[i] - y
+            if dx * dx + dy * dy <= limit:
+                found.append(handle)
+        return found
+
+    def query_point(self, x, y):
+        """Handles of the animals whose body (a circle of their size) covers (x, y)"""
+        animals = self.animals
+        xs, ys, sizes = animals.column('x'), animals.column('y'), animals.column('size')
+        cx, cy = self.cell(x, y)
+        found = []
+        for handle in self._handles_in_cells(cx - 1, cy - 1, cx + 1, cy + 1):
+            i = animals.index(handle)
+            dx, dy, radius = xs[i] - x, ys[i] - y, sizes[i] / 2
+            if dx * dx + dy * dy <= radius * radius:
+                found.append(handle)
+        return found
+
+    def resolve_collisions(self):
+        """Push overlapping animals apart, returns how many pairs overlapped.
+
+        Each overlapping pair moves apart along the line between their
+        centers by half the overlap each. Only pairs in the same or
+        neighbouring cells are compared, so the cost grows with the number
+        of animals, not its square. Moved animals are refiled afterwards.
+        """
+        animals = self.animals
+        index = animals.index
+        xs, ys, sizes = animals.column('x'), animals.column('y'), animals.column('size')
+        cells = self.cells
+        overlaps = 0
+        moved = set()
+        for (cx, cy), members in cells.items():
+            rows = [index(handle) for handle in members]
+            others = []
+            for dx, dy in _FORWARD_NEIGHBOURS:
+                neighbour = cells.get((cx + dx, cy + dy))
+                if neighbour:
+                    others.extend(index(handle) for handle in neighbour)
+            for n, a in enumerate(rows):
+                ax, ay, a_radius = xs[a], ys[a], sizes[a] / 2
+                for b in rows[n + 1:] + others:
+                    dx, dy = xs[b] - ax, ys[b] - ay
+                    reach = a_radius + sizes[b] / 2
+                    distance_sq = dx * dx + dy * dy
+                    if distance_sq >= reach * reach:
+                        continue
+                    distance = math.sqrt(distance_sq)
+                    if distance:
+                        ux, uy = dx / distance, dy / distance
+                    else:
+                        angle = (a + b) * _GOLDEN_ANGLE
+                        ux, uy = math.cos(angle), math.sin(angle)
+                    push = (reach - distance) / 2
+                    ax -= ux * push
+                    ay -= uy * push
+                    xs[b] += ux * push
+                    ys[b] += uy * push
+                    moved.add(b)
+                    overlaps += 1
+                if ax != xs[a] or ay != ys[a]:
+                    xs[a], ys[a] = ax, ay
+                    moved.add(a)
+        self.sync(moved)
+        return overlaps
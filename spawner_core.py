@@ -0,0 +1,277 @@
+import random
+
+from entity_store import EntityStore, np
+from spatial_grid import SpatialGrid
+from species import default_catalog
+
+
+def _no_visuals_many(animal_types, xs, ys, sizes, colors):
+    return [None] * len(xs), [()] * len(xs)
+
+
+def _no_delete(body_id, eyes):
+    pass
+
+
+def _no_clear():
+    pass
+
+
+class SpawnSchedule:
+    """Spawn rate as a function of how long the spawn key has been held.
+
+    Spawns `base_rate` animals per second for the first `hold` seconds,
+    then the rate doubles every `doubling_time` seconds up to `max_rate`.
+    Set `max_rate` equal to `base_rate` for a constant rate.
+    """
+
+    def __init__(self, base_rate=15, max_rate=500, hold=2.0, doubling_time=2.0):
+        self.base_rate = base_rate
+        self.max_rate = max(base_rate, max_rate)
+        self.hold = hold
+        self.doubling_time = doubling_time
+
+    def rate(self, hold_time):
+        """Animals per second after holding the key for `hold_time` seconds"""
+        if hold_time <= self.hold or self.doubling_time <= 0:
+            return self.base_rate
+        growth = 2 ** ((hold_time - self.hold) / self.doubling_time)
+        return min(self.max_rate, self.base_rate * growth)
+
+
+class SpawnerSimulation:
+    """Everything the animal spawner does that does not need Tk.
+
+    Holds the animals, the line layout that decides where the next animal
+    goes (`current_x`, `current_y`, `line_direction`), spawning while the
+    spawn key is held, and the physics step. Drawing is delegated to the
+    `create_visuals_many`/`delete_visuals`/`clear_visuals` hooks, which a
+    renderer can replace; by default animals get no visuals at all, which is what
+    headless runs and benchmarks want. All randomness comes from `rng`, so seeding it
+    makes a run reproducible.
+
+    `enable_grid` adds a SpatialGrid that is kept in step with the animals
+    for hit-testing; with `collisions` set, overlapping animals are pushed
+    apart through it every step. Setting `budget` to an EntityBudget caps
+    the number of animals, evicting old ones to make room for new ones.
+    Setting `physics` to a PhysicsWorker moves the physics step off this
+    thread; the simulation then only forwards its changes to the worker.
+    """
+
+    def __init__(self, width, height, rng=None, use_numpy=None, schedule=None, catalog=None):
+        self.width = width
+        self.height = height
+        self.rng = rng if rng is not None else random.Random()
+        self.catalog = catalog if catalog is not None else default_catalog()
+        self.animals = EntityStore(use_numpy=use_numpy)
+        self.create_visuals_many = _no_visuals_many
+        self.delete_visuals = _no_delete
+        self.clear_visuals = _no_clear
+        self.grid = None
+        self.collisions = False
+        self.budget = None
+        self.physics = None
+
+        # Line spawning variables
+        self.animal_spacing = 60  # Space between animals
+        self.line_height_increment = 80  # How much to move down for new line
+        self.reset_layout()
+
+        # Spawning while the spawn key is held
+        self.spawning = False
+        self.hold_time = 0
+        self.schedule = schedule if schedule is not None else SpawnSchedule()
+        self.spawn_debt = 0.0  # Fractional animals owed to the next step
+        self.spawn_scale = 1.0  # Fraction of the scheduled rate actually spawned
+
+    def enable_grid(self, cell_size=80):
+        """Start keeping a spatial grid of the animals, returns it"""
+        if self.grid is None:
+            self.grid = SpatialGrid(self.animals, cell_size)
+            self.grid.insert_rows(0, len(self.animals))
+        return self.grid
+
+    def reset_layout(self):
+        """Start placing animals from the top left again"""
+        self.current_x = 100  # Starting x position
+        self.current_y = 200  # Starting y position
+        self.line_direction = 1  # 1 for right, -1 for left
+
+    @property
+    def spawn_rate(self):
+        """Current spawn rate in animals per second (0 when not spawning)"""
+        return self.schedule.rate(self.hold_time) * self.spawn_scale if self.spawning else 0
+
+    def start_spawning(self):
+        if not self.spawning:
+            self.spawning = True
+            self.hold_time = 0
+            # Owe one animal right away so a tap always spawns something
+            self.spawn_debt = 1.0
+
+    def stop_spawning(self):
+        self.spawning = False
+        self.hold_time = 0
+        self.spawn_debt = 0.0
+
+    def advance_layout(self):
+        """Move the layout cursor to where the next animal goes"""
+        # Update position for next animal
+        self.current_x += self.animal_spacing * self.line_direction
+
+        # Check if we need to start a new line
+        if self.current_x > self.width - 100 and self.line_direction == 1:
+            # Hit right edge, start new line going left
+            self.current_y += self.line_height_increment
+            self.current_x = self.width - 100
+            self.line_direction = -1
+        elif self.current_x < 100 and self.line_direction == -1:
+            # Hit left edge, start new line going right
+            self.current_y += self.line_height_increment
+            self.current_x = 100
+            self.line_direction = 1
+
+        # Wrap around to top if we go too far down
+        if self.current_y > self.height - 100:
+            self.current_y = 200
+            self.current_x = 100
+            self.line_direction = 1
+
+    def create_animal(self):
+        """Add one animal at the layout cursor and return its index"""
+        return self.create_animals(1)
+
+    def create_animals(self, count):
+        """Add `count` animals along the line layout in one batch.
+
+        Positions, sizes, species and colors are picked for the whole batch
+        first, then the visuals are created in one pass and the batch is
+        appended to the store at once. Returns the index of the first new
+        animal.
+        """
+        rng = self.rng
+        catalog = self.catalog
+        xs, ys, sizes, colors, types, symbols, angles, bounces = [], [], [], [], [], [], [], []
+        for _ in range(count):
+            # Use current line position instead of random
+            xs.append(self.current_x)
+            ys.append(self.current_y)
+            self.advance_layout()
+            sizes.append(rng.randint(15, 80))  # Much wider size range: tiny to large
+
+            # Pick an animal type by its spawn weight
+            species = catalog.sample(rng)
+            colors.append(rng.choice(species.colors))
+            types.append(species.name)
+            symbols.append(species.symbol)
+            angles.append(rng.uniform(0, 360))
+            bounces.append(rng.uniform(0.8, 1.2))
+
+        # Create visual representations for the whole batch
+        body_ids, eyes = self.create_visuals_many(types, xs, ys, sizes, colors)
+
+        # Add the batch to the store (no movement or rotation - speeds stay 0)
+        start = self.animals.extend(xs, ys, sizes, colors, types, symbols, body_ids, eyes, angles, bounces)
+        self._added(start, count)
+        return start
+
+    def add_columns(self, floats, interned):
+        """Add a batch of animals given as whole columns, see EntityStore.extend_columns.
+
+        Used to restore snapshots: the visuals for the whole batch are created
+        in one call. Returns the index of the first new animal.
+        """
+        xs, ys = floats['x'].tolist(), floats['y'].tolist()
+        names = (interned['animal_type'], interned['color'])
+        if self.animals.use_numpy:
+            sizes = floats['size'].astype(np.int64).tolist()
+            types, colors = (np.array(values, dtype=object)[codes].tolist() for codes, values in names)
+        else:
+            sizes = [int(size) for size in floats['size']]
+            types, colors = (list(map(values.__getitem__, codes)) for codes, values in names)
+        body_ids, eyes = self.create_visuals_many(types, xs, ys, sizes, colors)
+        start = self.animals.extend_columns(floats, interned, body_ids, eyes)
+        self._added(start, len(xs))
+        return start
+
+    def _added(self, start, count):
+        if self.grid is not None:
+            self.grid.insert_rows(start, start + count)
+        if self.budget is not None:
+            self.budget.policy.added(self, start, count)
+        if self.physics is not None:
+            self.physics.added(self, start, count)
+
+    def remove_animal(self):
+        """Remove a random animal"""
+        if self.animals:
+            self.remove_index(self.animals.random_index(self.rng))
+
+    def remove_index(self, index):
+        """Remove the animal at `index`"""
+        self.delete_visuals(self.animals.id[index], self.animals.eyes[index])
+        if self.grid is not None:
+            self.grid.remove(self.animals.handle(index))
+        if self.physics is not None:
+            self.physics.removed(index)
+        # Swap-remove from the store
+        self.animals.remove(index)
+
+    def remove_handle(self, handle):
+        """Remove the animal with `handle`, returns False if it is already gone"""
+        index = self.animals.index(handle)
+        if index is None:
+            return False
+        self.remove_index(index)
+        return True
+
+    def clear(self):
+        """Remove every animal"""
+        self.clear_visuals()
+        self.animals.clear()
+        if self.grid is not None:
+            self.grid.clear()
+        if self.budget is not None:
+            self.budget.policy.cleared()
+        if self.physics is not None:
+            self.physics.cleared()
+
+    def spawn(self, dt):
+        """Spawn animals while the spawn key is held, returns how many were created.
+
+        The rate is integrated into `spawn_debt` and every whole animal owed
+        is created in one batch, so the number spawned over a hold is the
+        same whatever the step size and can exceed one per step. With a
+        budget, animals are evicted first to make room for the batch.
+        """
+        count = 0
+        if self.spawning:
+            self.hold_time += dt
+            # Spawn rate increases with time held (exponential growth)
+            self.spawn_debt += self.schedule.rate(self.hold_time) * self.spawn_scale * dt
+            count = int(self.spawn_debt)
+            self.spawn_debt -= count
+        if self.budget is not None:
+            # Evict first so the new animals fit, this also applies a lowered limit
+            count = self.budget.make_room(self, count, dt)
+        if count:
+            self.create_animals(count)
+        return count
+
+    def update(self, dt):
+        """Move, bounce and clamp every animal in one batched step"""
+        if self.physics is not None:
+            # The worker steps the animals on its own clock, take its latest positions
+            self.physics.collect(self)
+            return
+        if self.grid is not None and self.collisions:
+            # Before the step, so anything pushed off screen gets clamped back
+            self.grid.resolve_collisions()
+        self.animals.step(dt, self.width, self.height)
+        if self.grid is not None:
+            self.grid.sync(self.animals.moving_indices())
+
+    def step(self, dt):
+        """Advance the simulation by `dt` seconds"""
+        self.spawn(dt)
+        self.update(dt)
@@ -0,0 +1,194 @@
+"""Species catalog: what each animal looks like and how often it spawns.
+
+The catalog is built once. Every species refers to one of the body SHAPES,
+normalized templates given as fractions of the animal's size around its
+center, so placing an animal only scales a template (cached per size) and
+moves it to the animal's position. Species are picked by weight with an
+alias table, in constant time.
+
+Species can also be loaded from a JSON file, a list of entries like:
+
+    {"name": "pig", "symbol": "🐷", "colors": ["hotpink", "pink"],
+     "shape": "oval", "outline": "darkred", "weight": 1,
+     "eyes": [[-0.25, -0.3333], [0.1667, -0.3333]]}
+
+`weight` (default 1), `eyes` (default EYES) and `sprite`, a picture to
+draw the species with in image mode (default peppa.webp, relative paths
+are taken from the JSON file's folder), are optional.
+"""
+import json
+import math
+import os
+
+# Body templates: canvas item kind and coordinates as fractions of the size
+SHAPES = {
+    'oval': ('oval', (-1/2, -1/2, 1/2, 1/2)),
+    'rectangle': ('rectangle', (-1/3, -1/2, 1/3, 1/2)),
+    'diamond': ('polygon', (0, -1/2, 1/2, 0, 0, 1/2, -1/2, 0)),
+}
+
+# Top left corner of the left and right eye, as fractions of the size
+EYES = ((-1/4, -1/3), (1/6, -1/3))
+
+# Eyes are an eighth of the animal across, but never smaller than this
+MIN_EYE_SIZE = 2
+
+# Looked for next to this module when no catalog file is given
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'species.json')
+
+# Different animals with their characteristic colors
+DEFAULT_SPECIES = [
+    {'name': 'pig', 'colors': ['hotpink', 'pink', 'lightpink', 'deeppink'], 'symbol': '🐷',
+     'shape': 'oval', 'outline': 'darkred'},
+    {'name': 'sheep', 'colors': ['white', 'lightgray', 'ivory', 'snow'], 'symbol': '🐑',
+     'shape': 'oval', 'outline': 'darkred'},
+    {'name': 'lion', 'colors': ['gold', 'orange', 'goldenrod', 'darkorange'], 'symbol': '🦁',
+     'shape': 'diamond', 'outline': 'brown'},
+    {'name': 'cow', 'colors': ['black', 'white', 'gray', 'darkgray'], 'symbol': '🐄',
+     'shape': 'oval', 'outline': 'darkred'},
+    {'name': 'elephant', 'colors': ['gray', 'lightgray', 'darkgray', 'silver'], 'symbol': '🐘',
+     'shape': 'oval', 'outline': 'darkred'},
+    {'name': 'tiger', 'colors': ['orange', 'darkorange', 'coral', 'orangered'], 'symbol': '🐅',
+     'shape': 'diamond', 'outline': 'brown'},
+    {'name': 'horse', 'colors': ['brown', 'tan', 'chocolate', 'peru'], 'symbol': '🐴',
+     'shape': 'rectangle', 'outline': 'black'},
+    {'name': 'zebra', 'colors': ['black', 'white', 'darkslategray'], 'symbol': '🦓',
+     'shape': 'rectangle', 'outline': 'black'},
+    {'name': 'giraffe', 'colors': ['yellow', 'gold', 'khaki', 'palegoldenrod'], 'symbol': '🦒',
+     'shape': 'rectangle', 'outline': 'black'},
+    {'name': 'bear', 'colors': ['brown', 'saddlebrown', 'chocolate', 'sienna'], 'symbol': '🐻',
+     'shape': 'oval', 'outline': 'darkred'},
+]
+
+
+def scale(fraction, size):
+    """Pixel offset of `fraction` of `size`, rounded toward the center like `size // n`"""
+    # The epsilon absorbs fractions written out in decimal, such as 0.3333
+    return int(math.copysign(math.floor(abs(fraction) * size + 1e-6), fraction))
+
+
+class Species:
+    """One kind of animal, with its body and eye templates scaled on demand"""
+    __slots__ = ('name', 'symbol', 'colors', 'shape', 'kind', 'outline', 'weight', 'template',
+                 'eyes', 'sprite', 'layout', '_bodies', '_eye_boxes')
+
+    def __init__(self, name, symbol, colors, shape, outline, weight=1, eyes=EYES, sprite=None):
+        if shape not in SHAPES:
+            raise ValueError(f"unknown shape {shape!r} for {name}, expected one of {sorted(SHAPES)}")
+        self.name = name
+        self.symbol = symbol
+        self.colors = tuple(colors)
+        self.shape = shape
+        self.kind, self.template = SHAPES[shape]
+        self.outline = outline
+        self.weight = weight
+        self.eyes = tuple(tuple(eye) for eye in eyes)
+        self.sprite = sprite  # Picture file for image mode, None for the default one
+        self.layout = 0  # Index of this species' (shape, eyes) pair in its catalog
+        self._bodies = {}
+        self._eye_boxes = {}
+
+    def body_offsets(self, size):
+        """Body template scaled to `size`, relative to the animal's center"""
+        offsets = self._bodies.get(size)
+        if offsets is None:
+            offsets = self._bodies[size] = tuple(scale(f, size) for f in self.template)
+        return offsets
+
+    def body_coords(self, x, y, size):
+        """Canvas coordinates of the body of an animal at (x, y)"""
+        offsets = self.body_offsets(size)
+        return tuple(offset + (y if i % 2 else x) for i, offset in enumerate(offsets))
+
+    def eye_offsets(self, size):
+        """Boxes (x0, y0, x1, y1) of both eyes scaled to `size`, relative to the center"""
+        boxes = self._eye_boxes.get(size)
+        if boxes is None:
+            eye_size = max(MIN_EYE_SIZE, size // 8)
+            boxes = self._eye_boxes[size] = tuple(
+                (scale(fx, size), scale(fy, size), scale(fx, size) + eye_size, scale(fy, size) + eye_size)
+                for fx, fy in self.eyes)
+        return boxes
+
+    def eye_coords(self, x, y, size):
+        """Canvas coordinates of the left and right eye"""
+        return tuple((x + x0, y + y0, x + x1, y + y1) for x0, y0, x1, y1 in self.eye_offsets(size))
+
+
+class SpeciesCatalog:
+    """All species, looked up by name and sampled by weight"""
+
+    def __init__(self, species):
+        self.species = list(species)
+        if not self.species:
+            raise ValueError("a species catalog needs at least one species")
+        self.by_name = {species.name: species for species in self.species}
+        # Species that look the same share stamps in the framebuffer renderer
+        layouts = {}
+        for species in self.species:
+            species.layout = layouts.setdefault((species.shape, species.eyes), len(layouts))
+        self._build_alias_table()
+
+    def __getitem__(self, name):
+        return self.by_name[name]
+
+    def __iter__(self):
+        return iter(self.species)
+
+    def __len__(self):
+        return len(self.species)
+
+    def _build_alias_table(self):
+        """Vose's alias method: one column per species, each split between two species"""
+        n = len(self.species)
+        total = sum(species.weight for species in self.species)
+        scaled = [species.weight * n / total for species in self.species]
+        self.probability = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left over is 1.0 up to rounding error
+
+    def sample(self, rng):
+        """Pick a species at random in proportion to the weights"""
+        column = rng.randrange(len(self.species))
+        if rng.random() < self.probability[column]:
+            return self.species[column]
+        return self.species[self.alias[column]]
+
+    @classmethod
+    def from_entries(cls, entries):
+        return cls(Species(entry['name'], entry['symbol'], entry['colors'], entry['shape'],
+                           entry['outline'], entry.get('weight', 1), entry.get('eyes', EYES),
+                           entry.get('sprite'))
+                   for entry in entries)
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, encoding='utf-8') as f:
+            entries = json.load(f)
+        folder = os.path.dirname(os.path.abspath(path))
+        for entry in entries:
+            if entry.get('sprite'):
+                entry['sprite'] = os.path.join(folder, entry['sprite'])
+        return cls.from_entries(entries)
+
+
+_default_catalog = None
+
+
+def default_catalog():
+    """The built-in species, or species.json next to this module if there is one; built once"""
+    global _default_catalog
+    if _default_catalog is None:
+        if os.path.exists(DEFAULT_PATH):
+            _default_catalog = SpeciesCatalog.from_file(DEFAULT_PATH)
+        else:
+            _default_catalog = SpeciesCatalog.from_entries(DEFAULT_SPECIES)
+    return _default_catalog
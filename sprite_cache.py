@@ -0,0 +1,205 @@
+"""Sprites for image mode: decoded once to disk, scaled and tinted once per variant.
+
+Source pictures (peppa.webp, or a species' own `sprite`) are converted to
+PNG the first time they are seen and kept in SPRITE_CACHE_DIR under the
+SHA-256 of their bytes, so later runs read a Tk-native file instead of
+decoding the original again. Converting needs Pillow; without it only
+sources Tk reads itself (PNG, GIF, PPM/PGM) can be used.
+
+At runtime a SpriteCache hands out one PhotoImage per (species, size
+bucket, color), scaled to the bucket and tinted with the animal's color,
+so image mode shows the same sizes and colors as the shapes do.
+"""
+import base64
+import hashlib
+import io
+import os
+import shutil
+import tkinter as tk
+from collections import OrderedDict
+
+try:
+    from PIL import Image, ImageChops
+except ImportError:
+    Image = None
+
+# Where converted sprites are kept between runs
+SPRITE_CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache')),
+                                'pygames', 'sprites')
+
+# Part of every cache key, bump it when the conversion changes
+CACHE_VERSION = 1
+
+# The sprite used for every species without one of its own
+DEFAULT_SPRITE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'peppa.webp')
+
+# File signatures of the formats Tk decodes without Pillow
+_TK_NATIVE = (b'\x89PNG', b'GIF87a', b'GIF89a', b'P5', b'P6')
+
+
+def cached_sprite(source, cache_dir=SPRITE_CACHE_DIR):
+    """Path of a Tk-readable copy of `source`, converting it on first use.
+
+    Returns an in-memory PNG instead if the cache directory is not writable,
+    and None if the source is missing or cannot be converted.
+    """
+    try:
+        with open(source, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data.startswith(_TK_NATIVE):
+        return source  # Nothing to convert
+    if Image is None:
+        return None
+    digest = hashlib.sha256(b'%d:' % CACHE_VERSION + data).hexdigest()
+    path = os.path.join(cache_dir, digest + '.png')
+    if os.path.exists(path):
+        return path
+    try:
+        image = Image.open(io.BytesIO(data)).convert('RGBA')
+    except OSError:
+        return None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write under a temporary name so a half-written file is never picked up
+        partial = f"{path}.{os.getpid()}.tmp"
+        image.save(partial, 'PNG')
+        os.replace(partial, path)
+    except OSError:
+        # Read-only home: convert again next run, but still show the sprite now
+        png = io.BytesIO()
+        image.save(png, 'PNG')
+        png.seek(0)
+        return png
+    return path
+
+
+def clear_sprite_cache(cache_dir=SPRITE_CACHE_DIR):
+    """Delete every converted sprite"""
+    shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+class SpriteCache:
+    """Pre-scaled, pre-tinted PhotoImages per (species, size bucket, color).
+
+    Sizes are rounded to multiples of `bucket`, and the picture is scaled so
+    its longer side is the bucket. With Pillow the sprite is resampled and
+    multiplied by the animal's color; without it Tk's integer zoom and
+    subsample are used and sprites keep their own colors.
+
+    The cache keeps the `max_entries` most recently used variants. Every
+    canvas item showing a variant holds it through `acquire` until
+    `release`, and variants in use are never evicted, so the cache can grow
+    past `max_entries` while that many different ones are on screen.
+    """
+
+    def __init__(self, master, catalog, default=DEFAULT_SPRITE, bucket=8, max_entries=512,
+                 cache_dir=SPRITE_CACHE_DIR):
+        self.master = master
+        self.catalog = catalog
+        self.default = default
+        self.bucket = bucket
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.sources = {}  # Source path -> decoded picture, or None if it can't be loaded
+        self.variants = OrderedDict()  # Key -> PhotoImage, least recently used first
+        self.users = {}  # Key -> number of canvas items showing it
+        self.rgb_cache = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def source_of(self, animal_type):
+        species = self.catalog[animal_type]
+        return species.sprite or self.default
+
+    def _picture(self, source):
+        """The decoded source sprite, loaded once"""
+        if source not in self.sources:
+            path = source and cached_sprite(source, self.cache_dir)
+            picture = None
+            if path is not None:
+                try:
+                    if Image is not None:
+                        picture = Image.open(path).convert('RGBA')
+                    else:
+                        picture = tk.PhotoImage(master=self.master, file=path)
+                except (OSError, tk.TclError):
+                    picture = None
+            self.sources[source] = picture
+        return self.sources[source]
+
+    def has_sprite(self, animal_type):
+        return self._picture(self.source_of(animal_type)) is not None
+
+    def available(self):
+        """True if at least one species can be drawn as a sprite"""
+        return any(self.has_sprite(species.name) for species in self.catalog)
+
+    def size_bucket(self, size):
+        return max(self.bucket, int(size + self.bucket / 2) // self.bucket * self.bucket)
+
+    def acquire(self, animal_type, size, color):
+        """(key, PhotoImage) for an animal, or None if its species has no sprite"""
+        key = (animal_type, self.size_bucket(size), color)
+        image = self.variants.get(key)
+        if image is not None:
+            self.variants.move_to_end(key)
+            self.hits += 1
+        else:
+            picture = self._picture(self.source_of(animal_type))
+            if picture is None:
+                return None
+            image = self.variants[key] = self._render(picture, key[1], color)
+            self.misses += 1
+        self.users[key] = self.users.get(key, 0) + 1
+        self._evict()
+        return key, image
+
+    def release(self, key):
+        """One canvas item stopped showing the variant `key`"""
+        users = self.users[key] - 1
+        if users:
+            self.users[key] = users
+        else:
+            del self.users[key]
+
+    def release_all(self):
+        self.users.clear()
+        self._evict()
+
+    def _evict(self):
+        if len(self.variants) <= self.max_entries:
+            return
+        for key in list(self.variants):
+            if key not in self.users:
+                del self.variants[key]
+                self.evictions += 1
+                if len(self.variants) <= self.max_entries:
+                    break
+
+    def _rgb(self, color):
+        if color not in self.rgb_cache:
+            self.rgb_cache[color] = tuple(c >> 8 for c in self.master.winfo_rgb(color))
+        return self.rgb_cache[color]
+
+    def _render(self, picture, size, color):
+        """`picture` scaled so its longer side is `size`, tinted with `color`"""
+        if Image is None:
+            longest = max(picture.width(), picture.height())
+            if longest > size:
+                return picture.subsample(max(1, round(longest / size)))
+            return picture.zoom(max(1, size // longest))
+        width, height = picture.size
+        ratio = size / max(width, height)
+        scaled = picture.resize((max(1, round(width * ratio)), max(1, round(height * ratio))), Image.LANCZOS)
+        tinted = ImageChops.multiply(scaled, Image.new('RGBA', scaled.size, self._rgb(color) + (255,)))
+        png = io.BytesIO()
+        tinted.save(png, 'PNG')
+        return tk.PhotoImage(master=self.master, data=base64.b64encode(png.getvalue()).decode('ascii'),
+                             format='png')
+
+    def stats_text(self):
+        return (f"sprites: {len(self.variants)} cached, {len(self.users)} in use, "
+                f"{self.hits} hits, {self.misses} misses, {self.evictions} evicted")
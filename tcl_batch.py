@@ -0,0 +1,132 @@
+import re
+
+# Words that Tcl reads literally and need no quoting
+_PLAIN_WORD = re.compile(r'^[\w.#:+-]+$')
+_TCL_SPECIAL = re.compile(r'([\\"$\[\]{};])')
+
+
+class PendingItem:
+    """Handle for a canvas item created through a CanvasCommandBuffer.
+
+    `id` is None until the buffer is flushed and Tk has assigned the real
+    canvas item id. The handle can be passed to any later buffered command,
+    even in the same frame it was created in.
+    """
+    __slots__ = ('var', 'id')
+
+    def __init__(self, var):
+        self.var = var
+        self.id = None
+
+    def __repr__(self):
+        return f"PendingItem({self.var!r}, id={self.id})"
+
+
+def tcl_word(value):
+    """Quote a Python value as a single Tcl word"""
+    if isinstance(value, PendingItem):
+        return str(value.id) if value.id is not None else '$' + value.var
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (tuple, list)):
+        value = ' '.join(tcl_word(v) for v in value)
+    value = str(value)
+    if _PLAIN_WORD.match(value):
+        return value
+    return '"' + _TCL_SPECIAL.sub(r'\\\1', value).replace('\n', '\\n') + '"'
+
+
+class CanvasCommandBuffer:
+    """Collects canvas mutations and sends them to Tcl in bulk.
+
+    Mirrors the parts of the `tk.Canvas` API the spawner uses (`create_*`,
+    `coords`, `itemconfigure`, `tag_raise`, `delete`), but only queues
+    the commands. `flush` evaluates the queue as one Tcl script per
+    `max_commands` chunk, so a frame costs a handful of Python->Tcl
+    crossings instead of one per call. `create_*` returns a PendingItem
+    whose `id` is filled in by `flush`.
+    """
+
+    def __init__(self, canvas, max_commands=5000):
+        self.canvas = canvas
+        self.tk = canvas.tk
+        self.path = str(canvas)
+        self.max_commands = max_commands
+        self.queue = []
+        self.next_var = 0
+        # Stats about the last flush
+        self.last_commands = 0
+        self.last_evals = 0
+
+    def __len__(self):
+        return len(self.queue)
+
+    def _create(self, kind, coords, options):
+        if len(coords) == 1 and isinstance(coords[0], (tuple, list)):
+            coords = coords[0]
+        item = PendingItem(f"p{self.next_var}")
+        self.next_var += 1
+        self.queue.append(('create', item, (kind,) + tuple(coords), options))
+        return item
+
+    def create_oval(self, *coords, **options):
+        return self._create('oval', coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create('rectangle', coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self._create('polygon', coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create('image', coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create('text', coords, options)
+
+    def coords(self, item, *coords):
+        self.queue.append(('coords', item, coords, None))
+
+    def itemconfigure(self, item, **options):
+        self.queue.append(('itemconfigure', item, (), options))
+
+    def tag_raise(self, item):
+        self.queue.append(('raise', item, (), None))
+
+    def delete(self, *items):
+        if items:
+            self.queue.append(('delete', None, items, None))
+
+    def _script_line(self, command, item, args, options):
+        words = [self.path]
+        if command == 'create':
+            words.append('create')
+        else:
+            words.append(command)
+            if item is not None:
+                words.append(tcl_word(item))
+        words.extend(tcl_word(arg) for arg in args)
+        if options:
+            for key, value in options.items():
+                words.append('-' + key.rstrip('_'))
+                words.append(tcl_word(value))
+        line = ' '.join(words)
+        if command == 'create':
+            return f"set {item.var} [{line}]"
+        return line
+
+    def flush(self):
+        """Send every queued command to Tcl and resolve pending item ids"""
+        queue, self.queue = self.queue, []
+        self.last_commands = len(queue)
+        self.last_evals = 0
+        for start in range(0, len(queue), self.max_commands):
+            chunk = queue[start:start + self.max_commands]
+            created = [item for command, item, _, _ in chunk if command == 'create']
+            lines = [self._script_line(*entry) for entry in chunk]
+            lines.append('list ' + ' '.join('$' + item.var for item in created))
+            # apply keeps the pending-item variables local to this script
+            result = self.tk.call('apply', ('', '\n'.join(lines)))
+            self.last_evals += 1
+            for item, item_id in zip(created, self.tk.splitlist(result)):
+                item.id = int(item_id)